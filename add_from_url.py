@@ -5,9 +5,11 @@ Usage:
     python add_from_url.py URL1 URL2 ...
 
 Behavior:
-    - Fetches public metadata for each URL using the compliant scraper.
+    - Fetches public metadata for each URL using the compliant scraper, reusing
+      results fetched within the last few hours.
     - Extracts name (required) and firm (optional, from company).
-    - Inserts a row into `people` with the detected values.
+    - Inserts (or updates, for already tracked URLs) rows in `people` with the
+      detected values, all in one transaction.
     - Prints the created IDs or a clear SKIP reason.
 """
 
@@ -18,8 +20,7 @@ import sys
 from typing import List
 
 from db import init_db
-from models import add_person
-from scraper_public import fetch_public_headline
+from models import add_people_bulk, normalize_value
 
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
@@ -30,18 +31,21 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
 
 def main(argv: list[str] | None = None) -> int:
     args = parse_args(argv)
+    # Deferred so usage errors and --help skip importing requests/selectolax
+    from scraper_public import cached_fetch
+
     init_db()
 
-    added = 0
+    detected: list[dict[str, str | None]] = []
     for url in args.urls:
         if not url.lower().startswith("http"):
             print(f"[SKIP] {url} → invalid_url")
             continue
 
-        result = fetch_public_headline(url)
+        result = cached_fetch(url)
         error = result.get("error")
-        name = (result.get("name_from_page") or "").strip() or None
-        firm = (result.get("company") or "").strip() or None
+        name = normalize_value(result.get("name_from_page"))
+        firm = normalize_value(result.get("company"))
 
         if error and not name:
             print(f"[SKIP] {url} → {error}")
@@ -51,18 +55,21 @@ def main(argv: list[str] | None = None) -> int:
             print(f"[SKIP] {url} → could_not_detect_name")
             continue
 
-        try:
-            person_id = add_person(name=name, firm=firm, profile_url=url)
-        except Exception as exc:  # defensive
-            print(f"[SKIP] {url} → db_error:{exc}")
-            continue
+        detected.append({"name": name, "firm": firm, "profile_url": url})
 
-        firm_label = firm or "-"
-        print(f"[ADDED] id={person_id} name='{name}' firm='{firm_label}'")
-        added += 1
+    if not detected:
+        return 1
 
-    if added == 0:
+    try:
+        person_ids = add_people_bulk(detected)
+    except Exception as exc:  # defensive
+        for item in detected:
+            print(f"[SKIP] {item['profile_url']} → db_error:{exc}")
         return 1
+
+    for person_id, item in zip(person_ids, detected):
+        firm_label = item["firm"] or "-"
+        print(f"[ADDED] id={person_id} name='{item['name']}' firm='{firm_label}'")
     return 0
 
 
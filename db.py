@@ -8,7 +8,9 @@ at application start to ensure required tables exist.
 
 from __future__ import annotations
 
+import atexit
 import sqlite3
+import threading
 from pathlib import Path
 import os
 
@@ -22,32 +24,224 @@ if _data_dir:
 else:
     DB_PATH = Path(__file__).resolve().parent / DB_FILENAME
 
+# journal_mode=WAL is persistent in the database file, so it only needs to be
+# set once per process. WAL keeps `-wal` and `-shm` sidecar files next to
+# DB_PATH; they must live on the same (local) filesystem as the database, which
+# holds for the Render Disk mount as long as DATA_DIR points at the disk itself.
+_wal_enabled = False
+
+# Cached fetch results older than this are purged by init_db regardless of the
+# TTL callers use when reading the cache.
+FETCH_CACHE_MAX_AGE_HOURS = 24
+
+
+# One connection per thread, opened on first use and reused for every query
+_local = threading.local()
+
 
 def get_conn() -> sqlite3.Connection:
-    """Return a SQLite connection to the application database.
+    """Return this thread's SQLite connection to the application database.
 
+    The connection is created on first use and then reused by every call on
+    the same thread, keeping its page and statement caches warm. Callers must
+    not close it; use `close_conn` when a thread is done with the database.
     The connection has `row_factory` configured to return `sqlite3.Row`
     instances, enabling name-based column access.
     """
 
-    conn = sqlite3.connect(DB_PATH, timeout=10)
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _connect()
+        _local.conn = conn
+    return conn
+
+
+def close_conn() -> None:
+    """Close this thread's pooled connection, if one is open.
+
+    Connections of worker threads are released when the thread exits; the
+    main thread's connection is closed at interpreter exit.
+    """
+
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        _local.conn = None
+        conn.close()
+
+
+atexit.register(close_conn)
+
+
+def _connect() -> sqlite3.Connection:
+    """Open and configure a new connection to the application database."""
+
+    global _wal_enabled
+
+    # Connections are long-lived, so size the prepared-statement cache to hold
+    # every distinct statement the app issues.
+    conn = sqlite3.connect(DB_PATH, timeout=10, cached_statements=256)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON;")
     # Improve concurrency for background processing and tracker writes
     try:
-        conn.execute("PRAGMA journal_mode = WAL;")
+        if not _wal_enabled:
+            conn.execute("PRAGMA journal_mode = WAL;")
+            _wal_enabled = True
         conn.execute("PRAGMA busy_timeout = 5000;")
         conn.execute("PRAGMA synchronous = NORMAL;")
+        conn.execute("PRAGMA temp_store = MEMORY;")
+        conn.execute("PRAGMA cache_size = -65536;")
+        conn.execute("PRAGMA mmap_size = 268435456;")
     except sqlite3.DatabaseError:
         pass
     return conn
 
 
+# history.timestamp holds UTC Unix epoch seconds; exports format it as ISO-8601
+_HISTORY_COLUMNS = """
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    person_id INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    old_title TEXT,
+    new_title TEXT,
+    old_company TEXT,
+    new_company TEXT,
+    change_type TEXT NOT NULL,
+    FOREIGN KEY (person_id) REFERENCES people(id) ON DELETE CASCADE
+"""
+
+
+def _migrate_history_timestamps(conn: sqlite3.Connection) -> None:
+    """Rebuild a history table that still stores ISO-8601 text timestamps.
+
+    SQLite cannot change a column's type in place, so rows are copied into a
+    table with an INTEGER timestamp column, converted with strftime('%s').
+    """
+
+    columns = conn.execute("PRAGMA table_info(history)").fetchall()
+    timestamp_type = next(col["type"] for col in columns if col["name"] == "timestamp")
+    if timestamp_type.upper() == "INTEGER":
+        return
+
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute(f"CREATE TABLE history_migrated ({_HISTORY_COLUMNS});")
+    conn.execute(
+        """
+        INSERT INTO history_migrated (
+            id, person_id, timestamp, old_title, new_title, old_company, new_company, change_type
+        )
+        SELECT
+            id,
+            person_id,
+            COALESCE(CAST(strftime('%s', timestamp) AS INTEGER), 0),
+            old_title,
+            new_title,
+            old_company,
+            new_company,
+            change_type
+        FROM history
+        """
+    )
+    conn.execute("DROP TABLE history;")
+    conn.execute("ALTER TABLE history_migrated RENAME TO history;")
+    conn.commit()
+
+
+def _add_people_validator_columns(conn: sqlite3.Connection) -> None:
+    """Add the HTTP validator columns to a people table created before them.
+
+    `etag` and `last_modified` hold the response validators of each person's
+    last successful fetch, sent back as a conditional GET on the next run.
+    """
+
+    existing = {col["name"] for col in conn.execute("PRAGMA table_info(people)")}
+    for column in ("etag", "last_modified"):
+        if column not in existing:
+            conn.execute(f"ALTER TABLE people ADD COLUMN {column} TEXT;")
+
+
+def _merge_duplicate_profile_urls(conn: sqlite3.Connection) -> None:
+    """Fold people rows that share a profile URL into the oldest such row.
+
+    Databases created before profile URLs were unique may contain duplicates;
+    their history is re-pointed at the surviving row before they are removed.
+    The removed rows' name, firm and snapshot are lost, so each one is printed.
+    """
+
+    dropped = conn.execute(
+        """
+        SELECT dup.id, dup.profile_url, dup.name, dup.firm, dup.last_title,
+               dup.last_company, keep.keep_id
+        FROM people dup
+        JOIN (
+            SELECT profile_url, MIN(id) AS keep_id
+            FROM people
+            GROUP BY profile_url
+            HAVING COUNT(*) > 1
+        ) keep ON keep.profile_url = dup.profile_url
+        WHERE dup.id != keep.keep_id
+        ORDER BY dup.profile_url, dup.id
+        """
+    ).fetchall()
+    if not dropped:
+        return
+    for row in dropped:
+        print(
+            f"Merging duplicate of {row['profile_url']} into id {row['keep_id']}: "
+            f"dropped id {row['id']} (name={row['name']!r}, firm={row['firm']!r}, "
+            f"title={row['last_title']!r}, company={row['last_company']!r})"
+        )
+    conn.execute(
+        """
+        UPDATE history
+        SET person_id = (
+            SELECT MIN(keep.id)
+            FROM people keep
+            JOIN people dup ON dup.profile_url = keep.profile_url
+            WHERE dup.id = history.person_id
+        )
+        """
+    )
+    conn.execute(
+        "DELETE FROM people WHERE id NOT IN (SELECT MIN(id) FROM people GROUP BY profile_url)"
+    )
+
+
+def _create_change_counter(conn: sqlite3.Connection) -> None:
+    """Create the single-row counter bumped by every write to people or history.
+
+    Triggers keep it current for every writer, including the CLI tracker
+    running in another process, so readers can cache derived views (such as
+    the web UI's people table) and compare one integer to know when to rebuild.
+    """
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS change_counter (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        );
+        """
+    )
+    conn.execute("INSERT OR IGNORE INTO change_counter (id, version) VALUES (1, 0);")
+    for table, events in (("people", ("INSERT", "UPDATE", "DELETE")), ("history", ("INSERT", "DELETE"))):
+        for event in events:
+            conn.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_version
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE change_counter SET version = version + 1 WHERE id = 1;
+                END;
+                """
+            )
+
+
 def init_db() -> None:
     """Create database tables if they do not already exist."""
 
     conn = get_conn()
-    try:
+    with conn:
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS people (
@@ -57,28 +251,53 @@ def init_db() -> None:
                 profile_url TEXT NOT NULL,
                 last_title TEXT,
                 last_company TEXT,
-                last_seen TEXT
+                last_seen TEXT,
+                etag TEXT,
+                last_modified TEXT
             );
             """
         )
+        _add_people_validator_columns(conn)
+        conn.execute(f"CREATE TABLE IF NOT EXISTS history ({_HISTORY_COLUMNS});")
+        _migrate_history_timestamps(conn)
+        # Latest-change lookups per person, the export's timestamp ordering and
+        # list_people's firm/name ordering all read these indexes in order.
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_history_person_ts ON history(person_id, timestamp DESC);"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_history_ts ON history(timestamp);")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_people_firm_name ON people(firm, name);")
+        # Serves list_people's case-insensitive firm filter
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_people_firm ON people(firm COLLATE NOCASE);")
+        # One row per profile URL; required by the upserts in models
+        _merge_duplicate_profile_urls(conn)
+        conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_people_profile_url ON people(profile_url);"
+        )
+        _create_change_counter(conn)
         conn.execute(
             """
-            CREATE TABLE IF NOT EXISTS history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                person_id INTEGER NOT NULL,
-                timestamp TEXT NOT NULL,
-                old_title TEXT,
-                new_title TEXT,
-                old_company TEXT,
-                new_company TEXT,
-                change_type TEXT NOT NULL,
-                FOREIGN KEY (person_id) REFERENCES people(id) ON DELETE CASCADE
+            CREATE TABLE IF NOT EXISTS fetch_cache (
+                url TEXT PRIMARY KEY,
+                fetched_at TEXT NOT NULL,
+                title TEXT,
+                company TEXT,
+                name TEXT,
+                error TEXT
             );
             """
         )
-        conn.commit()
-    finally:
-        conn.close()
+        conn.execute(
+            "DELETE FROM fetch_cache WHERE fetched_at < strftime('%Y-%m-%dT%H:%M:%SZ', 'now', ?)",
+            (f"-{FETCH_CACHE_MAX_AGE_HOURS} hours",),
+        )
+        # Give the planner table statistics so it keeps choosing the indexes
+        # above (e.g. ix_history_ts for the export's ordered join): a full
+        # ANALYZE the first time, then the incremental PRAGMA optimize.
+        has_stats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+        ).fetchone()
+        conn.execute("PRAGMA optimize;" if has_stats else "ANALYZE;")
 
 
 if __name__ == "__main__":
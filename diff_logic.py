@@ -2,19 +2,11 @@
 
 from __future__ import annotations
 
+import datetime as dt
 import sqlite3
 from typing import Any, Dict
 
-from models import log_change, update_person_snapshot
-
-
-def _normalize(value: str | None) -> str | None:
-    """Return a stripped string or None if the value is empty."""
-
-    if value is None:
-        return None
-    stripped = value.strip()
-    return stripped or None
+from models import normalize_value, record_change_and_update, update_last_seen
 
 
 def _format_value(value: str | None) -> str:
@@ -23,31 +15,63 @@ def _format_value(value: str | None) -> str:
     return value if value is not None else "-"
 
 
+def record_not_modified(
+    person_row: sqlite3.Row,
+    conn: sqlite3.Connection | None = None,
+    today_iso: str | None = None,
+) -> Dict[str, Any]:
+    """Handle a profile the server reported as not modified (HTTP 304).
+
+    The stored snapshot is still current, so only `last_seen` moves. Returns
+    the same result shape as `detect_and_record_change`.
+    """
+
+    today_iso = today_iso or dt.date.today().isoformat()
+    person_id, person_name = person_row["id"], person_row["name"]
+    if person_row["last_seen"] != today_iso:
+        update_last_seen(person_id, last_seen=today_iso, conn=conn)
+    message = f"[NO CHANGE] {person_name} (not modified)"
+    return {"person_id": person_id, "name": person_name, "changed": False, "message": message}
+
+
 def detect_and_record_change(
     person_row: sqlite3.Row,
     observed_title: str | None,
     observed_company: str | None,
+    conn: sqlite3.Connection | None = None,
+    today_iso: str | None = None,
 ) -> Dict[str, Any]:
-    """Compare stored data with observed values and log changes as needed."""
-
-    observed_title_norm = _normalize(observed_title)
-    observed_company_norm = _normalize(observed_company)
-
-    person_id = int(person_row["id"])
-    person_name = person_row["name"]
-    last_title = person_row["last_title"]
-    last_company = person_row["last_company"]
+    """Compare stored data with observed values and log changes as needed.
+
+    Passing `conn` batches the writes into the caller's transaction; the
+    caller is then responsible for committing. Batch callers may also pass
+    `today_iso` once instead of it being computed per person.
+    """
+
+    today_iso = today_iso or dt.date.today().isoformat()
+    observed_title_norm = normalize_value(observed_title)
+    observed_company_norm = normalize_value(observed_company)
+
+    # Read every column once; person_row is not touched again below.
+    person_id, person_name, last_title, last_company, last_seen = (
+        person_row["id"],
+        person_row["name"],
+        person_row["last_title"],
+        person_row["last_company"],
+        person_row["last_seen"],
+    )
 
     if last_title is None and last_company is None:
-        log_change(
+        record_change_and_update(
             person_id=person_id,
             old_title=None,
             new_title=observed_title_norm,
             old_company=None,
             new_company=observed_company_norm,
             change_type="INIT",
+            last_seen=today_iso,
+            conn=conn,
         )
-        update_person_snapshot(person_id, observed_title_norm, observed_company_norm)
         message = (
             f"[INIT] {person_name}: title='{_format_value(observed_title_norm)}' "
             f"company='{_format_value(observed_company_norm)}'"
@@ -62,7 +86,10 @@ def detect_and_record_change(
     )
 
     if not title_changed and not company_changed:
-        update_person_snapshot(person_id, last_title, last_company)
+        # Nothing to write when the person was already seen today; otherwise
+        # only the last_seen date moves.
+        if last_seen != today_iso:
+            update_last_seen(person_id, last_seen=today_iso, conn=conn)
         message = f"[NO CHANGE] {person_name}"
         return {"person_id": person_id, "name": person_name, "changed": False, "message": message}
 
@@ -73,15 +100,16 @@ def detect_and_record_change(
     else:
         change_type = "COMPANY_CHANGE"
 
-    log_change(
+    record_change_and_update(
         person_id=person_id,
         old_title=last_title,
         new_title=observed_title_norm,
         old_company=last_company,
         new_company=observed_company_norm,
         change_type=change_type,
+        last_seen=today_iso,
+        conn=conn,
     )
-    update_person_snapshot(person_id, observed_title_norm, observed_company_norm)
 
     lines = [f"[CHANGE] {person_name}:"]
     if title_changed:
@@ -40,13 +40,13 @@ def render_table(rows: List[List[str]]) -> None:
     if not rows:
         return
 
-    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    widths = [max(map(len, column)) for column in zip(*rows)]
+    row_format = " | ".join(f"{{:<{width}}}" for width in widths)
 
     for idx, row in enumerate(rows):
-        padded = [row[i].ljust(widths[i]) for i in range(len(row))]
-        print(" | ".join(padded))
+        print(row_format.format(*row))
         if idx == 0:
-            print("-+-".join("-" * widths[i] for i in range(len(widths))))
+            print("-+-".join("-" * width for width in widths))
 
 
 def main() -> int:
@@ -4,88 +4,301 @@ from __future__ import annotations
 
 import csv
 import datetime as dt
+import functools
 import sqlite3
+import time
 from pathlib import Path
 from typing import Any, Iterable, Optional
 
 from db import get_conn
 
 
+# (epoch second, ISO-8601 text) of the last formatted timestamp. Stored as one
+# tuple so threads always read a matching pair.
+_last_iso_timestamp: tuple[int, str] = (-1, "")
+
+
+def _now_epoch() -> int:
+    """Return the current UTC time as whole Unix epoch seconds."""
+
+    return time.time_ns() // 1_000_000_000
+
+
+def _iso_utc(epoch_seconds: int) -> str:
+    """Format epoch seconds as `YYYY-MM-DDTHH:MM:SSZ`."""
+
+    moment = dt.datetime.fromtimestamp(epoch_seconds, dt.timezone.utc)
+    return moment.isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def _now_iso() -> str:
+    """Return the current UTC time as ISO-8601 text, formatted once per second."""
+
+    global _last_iso_timestamp
+
+    second = _now_epoch()
+    cached_second, cached_iso = _last_iso_timestamp
+    if second != cached_second:
+        cached_iso = _iso_utc(second)
+        _last_iso_timestamp = (second, cached_iso)
+    return cached_iso
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_value(value: str | None) -> str | None:
+    """Return a stripped string or None if the value is empty.
+
+    Memoized because the same firm, title and company strings repeat across
+    many people and tracker runs.
+    """
+
+    if value is None:
+        return None
+    return value.strip() or None
+
+
+_UPSERT_PERSON_SQL = """
+    INSERT INTO people (name, firm, profile_url, last_title, last_company, last_seen)
+    VALUES (?, ?, ?, NULL, NULL, NULL)
+    ON CONFLICT(profile_url) DO UPDATE SET
+        -- Bulk uploads use the URL as a placeholder name; keep any real one
+        name = CASE WHEN excluded.name = excluded.profile_url THEN people.name ELSE excluded.name END,
+        firm = COALESCE(excluded.firm, people.firm)
+    """
+
+
+def _person_params(name: str, firm: str | None, profile_url: str) -> tuple[str, str | None, str]:
+    return name.strip(), normalize_value(firm), profile_url.strip()
+
+
 def add_person(name: str, firm: str | None, profile_url: str) -> int:
-    """Insert a new person into the watchlist and return their ID."""
+    """Insert a new person into the watchlist and return their ID.
+
+    If the profile URL is already tracked, that person's name is updated (and
+    their firm, when one is given) and the existing ID is returned.
+    """
+
+    params = _person_params(name, firm, profile_url)
+    conn = get_conn()
+    with conn:
+        conn.execute(_UPSERT_PERSON_SQL, params)
+    row = conn.execute("SELECT id FROM people WHERE profile_url = ?", (params[2],)).fetchone()
+    return int(row["id"])
+
+
+def add_people_bulk(items: Iterable[dict[str, Any]]) -> list[int]:
+    """Insert or update many people in one transaction and return their IDs.
+
+    Each item needs `name` and `profile_url` keys and may carry `firm`. Rows
+    are upserted like `add_person`; IDs are returned in input order.
+    """
+
+    rows = [
+        _person_params(item["name"], item.get("firm"), item["profile_url"]) for item in items
+    ]
+    if not rows:
+        return []
 
-    firm_value = firm if firm is not None and firm.strip() else None
     conn = get_conn()
-    try:
+    with conn:
+        conn.executemany(_UPSERT_PERSON_SQL, rows)
+
+    urls = list(dict.fromkeys(row[2] for row in rows))
+    ids_by_url: dict[str, int] = {}
+    # Stay well under SQLite's bound-parameter limit
+    for start in range(0, len(urls), 500):
+        chunk = urls[start : start + 500]
+        placeholders = ",".join("?" * len(chunk))
         cursor = conn.execute(
-            """
-            INSERT INTO people (name, firm, profile_url, last_title, last_company, last_seen)
-            VALUES (?, ?, ?, NULL, NULL, NULL)
-            """,
-            (name.strip(), firm_value, profile_url.strip()),
+            f"SELECT id, profile_url FROM people WHERE profile_url IN ({placeholders})", chunk
         )
-        conn.commit()
-        return int(cursor.lastrowid)
-    finally:
-        conn.close()
+        ids_by_url.update((row["profile_url"], int(row["id"])) for row in cursor)
+    return [ids_by_url[row[2]] for row in rows]
 
 
 def get_person_by_id(person_id: int) -> sqlite3.Row | None:
     """Retrieve a person record by primary key."""
 
-    conn = get_conn()
-    try:
-        cursor = conn.execute("SELECT * FROM people WHERE id = ?", (person_id,))
-        return cursor.fetchone()
-    finally:
-        conn.close()
+    cursor = get_conn().execute("SELECT * FROM people WHERE id = ?", (person_id,))
+    return cursor.fetchone()
 
 
 def list_people(firm_filter: str | None = None) -> list[sqlite3.Row]:
-    """Return all tracked people, optionally filtered by firm."""
+    """Return all tracked people, optionally filtered by firm (case-insensitive).
+
+    Results are cached per data version (see `get_data_version`), so repeated
+    calls between writes skip the query. Reads inside an open transaction are
+    never cached, since a rollback could reuse the version they saw.
+    """
 
     conn = get_conn()
-    try:
-        if firm_filter:
-            cursor = conn.execute(
-                """
-                SELECT * FROM people
-                WHERE firm = ?
-                ORDER BY firm ASC, name ASC
-                """,
-                (firm_filter,),
-            )
-        else:
-            cursor = conn.execute(
-                """
-                SELECT * FROM people
-                ORDER BY firm ASC, name ASC
-                """
-            )
-        return list(cursor.fetchall())
-    finally:
-        conn.close()
+    if conn.in_transaction:
+        return list(_query_people(conn, firm_filter))
+    return list(_list_people_at_version(firm_filter, get_data_version()))
 
 
-def update_person_snapshot(
-    person_id: int, new_title: str | None, new_company: str | None
-) -> None:
-    """Update the stored snapshot for a person and mark the last seen date."""
+@functools.lru_cache(maxsize=16)
+def _list_people_at_version(firm_filter: str | None, version: int) -> tuple[sqlite3.Row, ...]:
+    return _query_people(get_conn(), firm_filter)
 
-    today_iso = dt.date.today().isoformat()
-    conn = get_conn()
-    try:
-        conn.execute(
+
+def _query_people(conn: sqlite3.Connection, firm_filter: str | None) -> tuple[sqlite3.Row, ...]:
+    if firm_filter:
+        cursor = conn.execute(
             """
-            UPDATE people
-            SET last_title = ?, last_company = ?, last_seen = ?
-            WHERE id = ?
+            SELECT * FROM people
+            WHERE firm = ? COLLATE NOCASE
+            ORDER BY firm ASC, name ASC
             """,
-            (new_title, new_company, today_iso, person_id),
+            (firm_filter,),
+        )
+    else:
+        cursor = conn.execute(
+            """
+            SELECT * FROM people
+            ORDER BY firm ASC, name ASC
+            """
         )
-        conn.commit()
-    finally:
-        conn.close()
+    return tuple(cursor.fetchall())
+
+
+def list_people_with_latest_change(firm_filter: str | None = None) -> list[sqlite3.Row]:
+    """Return tracked people with their most recent title change, if any.
+
+    Rows carry every people column plus `latest_old_title`/`latest_new_title`
+    (NULL without a title change), fetched in one query rather than one
+    `get_latest_title_change_for_person` call per person. `firm_filter`
+    matches case-insensitively, as in `list_people`.
+    """
+
+    where, params = ("WHERE p.firm = ? COLLATE NOCASE", (firm_filter,)) if firm_filter else ("", ())
+    cursor = get_conn().execute(
+        f"""
+        SELECT
+            p.*,
+            h.old_title AS latest_old_title,
+            h.new_title AS latest_new_title
+        FROM people p
+        LEFT JOIN (
+            -- SQLite takes the bare columns from the row holding MAX(timestamp)
+            SELECT person_id, old_title, new_title, MAX(timestamp) AS timestamp
+            FROM history
+            WHERE change_type IN ('TITLE_CHANGE','TITLE_AND_COMPANY_CHANGE')
+            GROUP BY person_id
+        ) h ON h.person_id = p.id
+        {where}
+        ORDER BY p.firm ASC, p.name ASC
+        """,
+        params,
+    )
+    return list(cursor.fetchall())
+
+
+def get_data_version() -> int:
+    """Return the counter bumped by every write to people or history.
+
+    Maintained by triggers (see `db.init_db`); callers compare it with the
+    value they saw last to decide whether cached views are still current.
+    """
+
+    row = get_conn().execute("SELECT version FROM change_counter WHERE id = 1").fetchone()
+    return row[0] if row else 0
+
+
+# Hot-path statements used once per tracked person, kept as constants so the
+# connection's statement cache always hits the same key.
+_UPDATE_SNAPSHOT_SQL = """
+    UPDATE people
+    SET last_title = ?, last_company = ?, last_seen = ?
+    WHERE id = ?
+    """
+
+_UPDATE_LAST_SEEN_SQL = "UPDATE people SET last_seen = ? WHERE id = ? AND last_seen IS NOT ?"
+
+_UPDATE_VALIDATORS_SQL = """
+    UPDATE people SET etag = ?, last_modified = ?
+    WHERE id = ? AND (etag IS NOT ? OR last_modified IS NOT ?)
+    """
+
+_INSERT_HISTORY_SQL = """
+    INSERT INTO history (
+        person_id, timestamp, old_title, new_title, old_company, new_company, change_type
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+
+
+def update_person_snapshot(
+    person_id: int,
+    new_title: str | None,
+    new_company: str | None,
+    *,
+    last_seen: str | None = None,
+    conn: sqlite3.Connection | None = None,
+) -> None:
+    """Update the stored snapshot for a person and mark the last seen date.
+
+    `last_seen` defaults to today; batch callers pass it once for the run.
+    When `conn` is given, the update joins the caller's open transaction and
+    is left for the caller to commit.
+    """
+
+    last_seen = last_seen or dt.date.today().isoformat()
+    params = (new_title, new_company, last_seen, person_id)
+    if conn is not None:
+        conn.execute(_UPDATE_SNAPSHOT_SQL, params)
+        return
+
+    conn = get_conn()
+    with conn:
+        conn.execute(_UPDATE_SNAPSHOT_SQL, params)
+
+
+def update_last_seen(
+    person_id: int,
+    *,
+    last_seen: str | None = None,
+    conn: sqlite3.Connection | None = None,
+) -> None:
+    """Mark a person as seen without touching their stored snapshot.
+
+    `last_seen` defaults to today; the update is skipped by SQL when the
+    stored value already matches. When `conn` is given, the update joins the
+    caller's open transaction and is left for the caller to commit.
+    """
+
+    last_seen = last_seen or dt.date.today().isoformat()
+    params = (last_seen, person_id, last_seen)
+    if conn is not None:
+        conn.execute(_UPDATE_LAST_SEEN_SQL, params)
+        return
+
+    conn = get_conn()
+    with conn:
+        conn.execute(_UPDATE_LAST_SEEN_SQL, params)
+
+
+def update_http_validators(
+    person_id: int,
+    etag: str | None,
+    last_modified: str | None,
+    *,
+    conn: sqlite3.Connection | None = None,
+) -> None:
+    """Store the ETag/Last-Modified validators from a person's latest fetch.
+
+    The update is skipped by SQL when both values are unchanged. When `conn`
+    is given, the update joins the caller's open transaction and is left for
+    the caller to commit.
+    """
+
+    params = (etag, last_modified, person_id, etag, last_modified)
+    if conn is not None:
+        conn.execute(_UPDATE_VALIDATORS_SQL, params)
+        return
+
+    conn = get_conn()
+    with conn:
+        conn.execute(_UPDATE_VALIDATORS_SQL, params)
 
 
 def log_change(
@@ -95,105 +308,146 @@ def log_change(
     old_company: str | None,
     new_company: str | None,
     change_type: str,
+    *,
+    conn: sqlite3.Connection | None = None,
 ) -> None:
-    """Record a detected change for a person in the history table."""
+    """Record a detected change for a person in the history table.
+
+    When `conn` is given, the insert joins the caller's open transaction and
+    is left for the caller to commit.
+    """
+
+    timestamp = _now_epoch()
+    params = (person_id, timestamp, old_title, new_title, old_company, new_company, change_type)
+    if conn is not None:
+        conn.execute(_INSERT_HISTORY_SQL, params)
+        return
 
-    timestamp = dt.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
     conn = get_conn()
-    try:
-        conn.execute(
-            """
-            INSERT INTO history (
-                person_id, timestamp, old_title, new_title, old_company, new_company, change_type
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (person_id, timestamp, old_title, new_title, old_company, new_company, change_type),
-        )
-        conn.commit()
-    finally:
-        conn.close()
+    with conn:
+        conn.execute(_INSERT_HISTORY_SQL, params)
+
+
+def record_change_and_update(
+    person_id: int,
+    old_title: str | None,
+    new_title: str | None,
+    old_company: str | None,
+    new_company: str | None,
+    change_type: str,
+    *,
+    last_seen: str | None = None,
+    conn: sqlite3.Connection | None = None,
+) -> None:
+    """Log a change and store the new snapshot for a person in one transaction.
+
+    Equivalent to `log_change` followed by `update_person_snapshot`, but both
+    statements share a single commit. `last_seen` defaults to today. When
+    `conn` is given, they join the caller's open transaction and are left for
+    the caller to commit.
+    """
+
+    history_params = (
+        person_id,
+        _now_epoch(),
+        old_title,
+        new_title,
+        old_company,
+        new_company,
+        change_type,
+    )
+    snapshot_params = (
+        new_title,
+        new_company,
+        last_seen or dt.date.today().isoformat(),
+        person_id,
+    )
+    if conn is not None:
+        conn.execute(_INSERT_HISTORY_SQL, history_params)
+        conn.execute(_UPDATE_SNAPSHOT_SQL, snapshot_params)
+        return
+
+    conn = get_conn()
+    with conn:
+        conn.execute(_INSERT_HISTORY_SQL, history_params)
+        conn.execute(_UPDATE_SNAPSHOT_SQL, snapshot_params)
 
 
 def get_history_for_person(person_id: int) -> list[sqlite3.Row]:
     """Return the change history for a specific person ordered newest-first."""
 
-    conn = get_conn()
-    try:
-        cursor = conn.execute(
-            """
-            SELECT * FROM history
-            WHERE person_id = ?
-            ORDER BY timestamp DESC
-            """,
-            (person_id,),
-        )
-        return list(cursor.fetchall())
-    finally:
-        conn.close()
+    cursor = get_conn().execute(
+        """
+        SELECT * FROM history
+        WHERE person_id = ?
+        ORDER BY timestamp DESC
+        """,
+        (person_id,),
+    )
+    return list(cursor.fetchall())
+
+
+# Column order of history CSV exports, matching iter_history_export_rows
+HISTORY_CSV_HEADER = (
+    "timestamp",
+    "name",
+    "firm",
+    "old_title",
+    "new_title",
+    "old_company",
+    "new_company",
+    "change_type",
+)
+
+_EXPORT_HISTORY_SQL = """
+    SELECT
+        strftime('%Y-%m-%dT%H:%M:%SZ', h.timestamp, 'unixepoch') AS timestamp,
+        p.name,
+        p.firm,
+        h.old_title,
+        h.new_title,
+        h.old_company,
+        h.new_company,
+        h.change_type
+    FROM history h
+    JOIN people p ON p.id = h.person_id
+    ORDER BY h.timestamp ASC
+    """
+
+
+def iter_history_export_rows() -> sqlite3.Cursor:
+    """Return a cursor over every history row in export order.
+
+    Rows follow `HISTORY_CSV_HEADER` and are produced lazily as the cursor is
+    iterated, so callers can stream exports without holding the whole table.
+    """
+
+    return get_conn().execute(_EXPORT_HISTORY_SQL)
 
 
 def export_full_history_to_csv(csv_path: str | Path) -> None:
-    """Export all change history records to a CSV file."""
+    """Export all change history records to a CSV file.
 
-    path = Path(csv_path)
-    conn = get_conn()
-    try:
-        cursor = conn.execute(
-            """
-            SELECT
-                h.timestamp,
-                p.name,
-                p.firm,
-                h.old_title,
-                h.new_title,
-                h.old_company,
-                h.new_company,
-                h.change_type
-            FROM history h
-            JOIN people p ON p.id = h.person_id
-            ORDER BY h.timestamp ASC
-            """
-        )
-        rows = cursor.fetchall()
-    finally:
-        conn.close()
+    Rows are streamed from the cursor straight into the CSV writer, so memory
+    use does not grow with the size of the history table.
+    """
 
+    path = Path(csv_path)
     path.parent.mkdir(parents=True, exist_ok=True)
+    cursor = iter_history_export_rows()
     with path.open("w", newline="", encoding="utf-8") as csv_file:
         writer = csv.writer(csv_file)
-        writer.writerow(
-            [
-                "timestamp",
-                "name",
-                "firm",
-                "old_title",
-                "new_title",
-                "old_company",
-                "new_company",
-                "change_type",
-            ]
-        )
-        writer.writerows(rows)
+        writer.writerow(HISTORY_CSV_HEADER)
+        writer.writerows(cursor)
+
+
+_PERSON_FIELDS = ("id", "name", "firm", "profile_url", "last_title", "last_company", "last_seen")
 
 
 def get_all_people_as_dicts() -> list[dict[str, Any]]:
     """Return all people as dictionaries for easy serialization."""
 
-    people_rows = list_people()
-    result: list[dict[str, Any]] = []
-    for row in people_rows:
-        result.append(
-            {
-                "id": int(row["id"]),
-                "name": row["name"],
-                "firm": row["firm"],
-                "profile_url": row["profile_url"],
-                "last_title": row["last_title"],
-                "last_company": row["last_company"],
-                "last_seen": row["last_seen"],
-            }
-        )
-    return result
+    return [{field: row[field] for field in _PERSON_FIELDS} for row in list_people()]
 
 
 def update_person_firm_by_id(person_id: int, firm: str | None) -> None:
@@ -202,37 +456,27 @@ def update_person_firm_by_id(person_id: int, firm: str | None) -> None:
     Passing an empty or whitespace-only string will clear the firm (set to NULL).
     """
 
-    normalized_firm = firm.strip() if isinstance(firm, str) else None
-    if not normalized_firm:
-        normalized_firm = None
+    normalized_firm = normalize_value(firm)
 
     conn = get_conn()
-    try:
+    with conn:
         conn.execute("UPDATE people SET firm = ? WHERE id = ?", (normalized_firm, person_id))
-        conn.commit()
-    finally:
-        conn.close()
 
 
 def update_person_firm_by_url(profile_url: str, firm: str | None) -> int:
-    """Update the firm for person(s) matching a profile URL.
+    """Update the firm for the person with a profile URL.
 
-    Returns the count of rows updated. If duplicates exist, all matches are updated.
+    Profile URLs are unique, so this returns 1 if the URL is tracked and 0 otherwise.
     """
 
-    normalized_firm = firm.strip() if isinstance(firm, str) else None
-    if not normalized_firm:
-        normalized_firm = None
+    normalized_firm = normalize_value(firm)
 
     conn = get_conn()
-    try:
+    with conn:
         cursor = conn.execute(
             "UPDATE people SET firm = ? WHERE profile_url = ?", (normalized_firm, profile_url)
         )
-        conn.commit()
-        return cursor.rowcount if cursor.rowcount is not None else 0
-    finally:
-        conn.close()
+    return cursor.rowcount if cursor.rowcount is not None else 0
 
 
 def get_latest_title_change_for_person(person_id: int) -> sqlite3.Row | None:
@@ -242,19 +486,86 @@ def get_latest_title_change_for_person(person_id: int) -> sqlite3.Row | None:
     TITLE_CHANGE or TITLE_AND_COMPANY_CHANGE.
     """
 
-    conn = get_conn()
-    try:
-        cursor = conn.execute(
-            """
-            SELECT old_title, new_title, timestamp, change_type
-            FROM history
-            WHERE person_id = ? AND change_type IN ('TITLE_CHANGE','TITLE_AND_COMPANY_CHANGE')
-            ORDER BY timestamp DESC
-            LIMIT 1
-            """,
-            (person_id,),
-        )
-        return cursor.fetchone()
-    finally:
-        conn.close()
+    cursor = get_conn().execute(
+        """
+        SELECT old_title, new_title, timestamp, change_type
+        FROM history
+        WHERE person_id = ? AND change_type IN ('TITLE_CHANGE','TITLE_AND_COMPANY_CHANGE')
+        ORDER BY timestamp DESC
+        LIMIT 1
+        """,
+        (person_id,),
+    )
+    return cursor.fetchone()
 
+
+def _cache_row_to_result(row: sqlite3.Row) -> dict[str, str | None]:
+    return {
+        "name_from_page": row["name"],
+        "title": row["title"],
+        "company": row["company"],
+        "error": row["error"],
+    }
+
+
+def _cache_cutoff(max_age: dt.timedelta) -> str:
+    return _iso_utc(_now_epoch() - int(max_age.total_seconds()))
+
+
+def get_cached_headline(profile_url: str, max_age: dt.timedelta) -> dict[str, str | None] | None:
+    """Return the cached fetch result for a URL if it is younger than `max_age`."""
+
+    cursor = get_conn().execute(
+        "SELECT * FROM fetch_cache WHERE url = ? AND fetched_at >= ?",
+        (profile_url, _cache_cutoff(max_age)),
+    )
+    row = cursor.fetchone()
+    return _cache_row_to_result(row) if row is not None else None
+
+
+def get_cached_headlines(max_age: dt.timedelta) -> dict[str, dict[str, str | None]]:
+    """Return all cached fetch results younger than `max_age`, keyed by URL.
+
+    Only the CLI tracker writes the cache while other paths (web refreshes,
+    bulk lookups, 304s) update snapshots directly, so a cached headline may
+    predate the stored snapshot and must not be diffed against it.
+    """
+
+    cursor = get_conn().execute(
+        "SELECT * FROM fetch_cache WHERE fetched_at >= ?", (_cache_cutoff(max_age),)
+    )
+    return {row["url"]: _cache_row_to_result(row) for row in cursor}
+
+
+def save_cached_headline(
+    profile_url: str,
+    result: dict[str, Any],
+    *,
+    conn: sqlite3.Connection | None = None,
+) -> None:
+    """Store a fetch result in the cache, replacing any previous entry for the URL.
+
+    When `conn` is given, the write joins the caller's open transaction and
+    is left for the caller to commit.
+    """
+
+    fetched_at = _now_iso()
+    sql = """
+        INSERT OR REPLACE INTO fetch_cache (url, fetched_at, title, company, name, error)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """
+    params = (
+        profile_url,
+        fetched_at,
+        result.get("title"),
+        result.get("company"),
+        result.get("name_from_page"),
+        result.get("error"),
+    )
+    if conn is not None:
+        conn.execute(sql, params)
+        return
+
+    conn = get_conn()
+    with conn:
+        conn.execute(sql, params)
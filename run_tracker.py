@@ -3,15 +3,26 @@
 from __future__ import annotations
 
 import argparse
+import datetime as dt
+import itertools
 import sys
-import time
-import random
-from typing import Any
 
-from db import init_db
-from diff_logic import detect_and_record_change
-from models import list_people
-from scraper_public import fetch_public_headline
+from db import get_conn, init_db
+from diff_logic import detect_and_record_change, record_not_modified
+from models import (
+    get_cached_headlines,
+    list_people,
+    save_cached_headline,
+    update_http_validators,
+)
+
+# The scrapers (requests/selectolax, aiohttp) are imported where they are used,
+# so `--help` and argument errors return without paying for them.
+
+
+# Number of tracker writes that share one transaction before committing. Bounds
+# WAL growth and how long the write lock is held during long runs.
+COMMIT_EVERY = 50
 
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
@@ -30,6 +41,23 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         default=5.0,
         help="Delay between profile fetches (seconds)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Maximum number of profile fetches in flight at once",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Fetch with asyncio/aiohttp on one thread instead of a thread pool",
+    )
+    parser.add_argument(
+        "--force-refresh",
+        action="store_true",
+        help="Ignore cached results and fetch every profile",
+    )
     return parser.parse_args(argv)
 
 
@@ -40,6 +68,11 @@ def main(argv: list[str] | None = None) -> int:
     if args.delay_seconds < 0:
         print("Delay must be non-negative.", file=sys.stderr)
         return 1
+    if args.workers < 1:
+        print("Workers must be at least 1.", file=sys.stderr)
+        return 1
+
+    from scraper_public import CACHEABLE_ERRORS, DEFAULT_CACHE_TTL, fetch_many
 
     init_db()
     people = list_people(args.firm_filter)
@@ -55,29 +88,94 @@ def main(argv: list[str] | None = None) -> int:
     unchanged_count = 0
     skipped_count = 0
 
-    delay = args.delay_seconds
-
-    for index, person in enumerate(people):
-        person_name = person["name"]
-        firm_label = person["firm"] or "-"
-        try:
-            result = fetch_public_headline(person["profile_url"])
-        except Exception as exc:  # pragma: no cover - defensive catch
-            skipped_count += 1
-            print(f"[SKIP] {person_name} ({firm_label}) → unexpected_error:{exc}")
-            continue
-
-        error = result.get("error")
-        observed_title = result.get("title")
-        observed_company = result.get("company")
-
-        if error or (observed_title is None and observed_company is None):
-            skipped_count += 1
-            reason = error or "profile not public / no headline"
-            print(f"[SKIP] {person_name} ({firm_label}) → {reason}")
-        else:
+    cached = {} if args.force_refresh else get_cached_headlines(DEFAULT_CACHE_TTL)
+    to_fetch = [person for person in people if person["profile_url"] not in cached]
+    if args.use_async:
+        from scraper_public_async import fetch_many as fetch_many_async
+
+        fetched = fetch_many_async(to_fetch, args.delay_seconds)
+    else:
+        fetched = fetch_many(to_fetch, args.workers, args.delay_seconds)
+    outcomes = itertools.chain(
+        (
+            (person, cached[person["profile_url"]])
+            for person in people
+            if person["profile_url"] in cached
+        ),
+        fetched,
+    )
+
+    # Diffing and DB writes (including cache fills) stay on this thread, which
+    # owns the connection and its batched transaction; only fetches are concurrent.
+    conn = get_conn()
+    pending_writes = 0
+    today_iso = dt.date.today().isoformat()
+    try:
+        for person, result in outcomes:
+            if pending_writes >= COMMIT_EVERY:
+                conn.commit()
+                pending_writes = 0
+
+            person_name = person["name"]
+            firm_label = person["firm"] or "-"
+            if isinstance(result, BaseException):
+                skipped_count += 1
+                print(f"[SKIP] {person_name} ({firm_label}) → unexpected_error:{result}")
+                continue
+
+            from_cache = person["profile_url"] in cached
+            error = result.get("error")
+            observed_title = result.get("title")
+            observed_company = result.get("company")
+            headline_missing = error or (observed_title is None and observed_company is None)
+
+            if from_cache and (
+                person["last_title"] is not None or person["last_company"] is not None
+            ):
+                # A cache hit is not a new observation: web /run, /bulk and 304s
+                # update snapshots without writing fetch_cache, so the cached
+                # headline may be older than the stored one. Never diff it.
+                # (With no stored snapshot there is nothing newer to revert, so
+                # such people fall through and are initialized from the cache.)
+                if headline_missing:
+                    skipped_count += 1
+                    reason = error or "profile not public / no headline"
+                    print(f"[SKIP] {person_name} ({firm_label}) → {reason} (cached)")
+                else:
+                    print(f"[CACHED] {person_name} (fetched recently; not refetched)")
+                    unchanged_count += 1
+                continue
+
+            if result.get("unchanged"):
+                # 304 Not Modified: the stored snapshot is still current
+                try:
+                    diff_result = record_not_modified(person, conn=conn, today_iso=today_iso)
+                except Exception as exc:  # pragma: no cover - defensive catch
+                    skipped_count += 1
+                    print(f"[SKIP] {person_name} ({firm_label}) → diff_error:{exc}")
+                    continue
+                print(diff_result["message"])
+                unchanged_count += 1
+                pending_writes += 1
+                continue
+
+            if not from_cache and error in CACHEABLE_ERRORS:
+                save_cached_headline(person["profile_url"], result, conn=conn)
+                pending_writes += 1
+
+            if headline_missing:
+                skipped_count += 1
+                reason = error or "profile not public / no headline"
+                print(f"[SKIP] {person_name} ({firm_label}) → {reason}")
+                continue
+
             try:
-                diff_result = detect_and_record_change(person, observed_title, observed_company)
+                diff_result = detect_and_record_change(
+                    person, observed_title, observed_company, conn=conn, today_iso=today_iso
+                )
+                update_http_validators(
+                    person["id"], result.get("etag"), result.get("last_modified"), conn=conn
+                )
             except Exception as exc:  # pragma: no cover - defensive catch
                 skipped_count += 1
                 print(f"[SKIP] {person_name} ({firm_label}) → diff_error:{exc}")
@@ -88,10 +186,11 @@ def main(argv: list[str] | None = None) -> int:
                 changed_count += 1
             else:
                 unchanged_count += 1
-
-        if index < total - 1 and delay:
-            # Add small jitter to reduce likelihood of rate limiting
-            time.sleep(delay + random.uniform(0.0, 0.6))
+            pending_writes += 1
+    finally:
+        # Stop fetching at once if the loop ended early (e.g. Ctrl-C)
+        fetched.close()
+        conn.commit()
 
     print(
         f"Checked {total} people. {changed_count} changed. "
@@ -14,14 +14,32 @@ WARNING:
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import datetime as dt
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
 import requests
-from bs4 import BeautifulSoup
-import time
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 
+from models import get_cached_headline, save_cached_headline
+from throttle import HostRateLimiter
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - fallback when orjson is unavailable
+    from json import loads as _json_loads
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - fallback when selectolax is unavailable
+    LexborHTMLParser = None
+    from bs4 import BeautifulSoup, SoupStrainer
+
 
 USER_AGENT = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -29,171 +47,464 @@ USER_AGENT = (
 )
 
 
-def fetch_public_headline(profile_url: str) -> Dict[str, Optional[str]]:
+REQUEST_HEADERS = {
+    "User-Agent": USER_AGENT,
+    # Be explicit to receive the standard public HTML rendition
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    # Hint that this request originates from the open web (reduces authwall)
+    "Referer": "https://www.google.com/",
+    # Accept-Encoding is left to requests/aiohttp: both advertise gzip and
+    # deflate, plus br when the Brotli package is installed, and decode what
+    # they advertise.
+}
+
+# Transient upstream failures that earn one gentle retry; no evasion
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+
+class _PoliteRetry(Retry):
+    """Retry that also waits `backoff_factor` seconds before the first retry.
+
+    urllib3 only backs off from the second consecutive retry onwards.
+    """
+
+    def get_backoff_time(self) -> float:
+        return float(self.backoff_factor) if self.history else 0.0
+
+
+def _build_session() -> requests.Session:
+    """Create the shared HTTP session used for every synchronous fetch.
+
+    Reusing one session keeps TCP/TLS connections to LinkedIn alive between
+    profiles. Transient 5xx responses are retried once after a 1s backoff by
+    urllib3; the final response is returned rather than raised.
+    """
+
+    session = requests.Session()
+    session.headers.update(REQUEST_HEADERS)
+    # Stay stateless like one-off requests: never store or replay cookies
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    retry = _PoliteRetry(
+        total=1,
+        status_forcelist=sorted(RETRY_STATUSES),
+        backoff_factor=1,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+SESSION = _build_session()
+
+# Host every profile fetch goes to; warmed up by prewarm_session
+LINKEDIN_ORIGIN = "https://www.linkedin.com/"
+
+
+def prewarm_session(timeout: float = 5.0) -> None:
+    """Open a keep-alive connection to LinkedIn ahead of the first fetch.
+
+    A HEAD request of the public home page pays DNS, TCP and TLS setup once
+    and leaves the socket in the session's pool. Failures are ignored; the
+    first real fetch then simply connects as usual.
+    """
+
+    try:
+        SESSION.head(LINKEDIN_ORIGIN, timeout=timeout)
+    except requests.RequestException:
+        pass
+
+
+# Maximum number of body bytes read from a profile page
+HEAD_READ_LIMIT = 64 * 1024
+
+# Leading characters of a page searched for the sign-in form by
+# is_authwall_or_login. The form sits in <body>, so a head-only read must still
+# cover this many bytes: UTF-8 needs at most 4 per character.
+AUTHWALL_SCAN_CHARS = 5000
+AUTHWALL_SCAN_BYTES = 4 * AUTHWALL_SCAN_CHARS
+
+# Bodies declared at most this large are read to the end once the head is in,
+# so their keep-alive connection returns to the pool; larger ones are cut off.
+DRAIN_LIMIT = 2 * HEAD_READ_LIMIT
+
+# How long a fetched headline is reused before the profile is requested again
+DEFAULT_CACHE_TTL = dt.timedelta(hours=6)
+
+# Outcomes worth caching: a parsed headline, or a public page without one.
+# Network errors, bad statuses and authwalls are transient and always refetched.
+CACHEABLE_ERRORS = frozenset({None, "no_public_headline"})
+
+
+def _append_query_param(url: str, key: str, value: str) -> str:
+    parsed = urlparse(url)
+    query = dict(parse_qsl(parsed.query, keep_blank_values=True))
+    if key not in query:
+        query[key] = value
+    new_query = urlencode(query)
+    return urlunparse((parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment))
+
+
+def candidate_urls(profile_url: str) -> list[str]:
+    """Return the public URL variants tried, in order, for a profile."""
+
+    return [
+        profile_url,
+        _append_query_param(profile_url, "trk", "public_profile"),
+        _append_query_param(profile_url, "trk", "public_profile_browsemap"),
+    ]
+
+
+def head_read_complete(buffer: bytes) -> bool:
+    """Return True once a streamed body holds enough to parse, or hits the cap.
+
+    Everything the headline is parsed from (meta tags, `<title>`, JSON-LD)
+    sits in the document head, but the authwall check also scans the start
+    of `<body>`; reading stops once both are in, so the rest of the page is
+    never downloaded.
+    """
+
+    if len(buffer) >= HEAD_READ_LIMIT:
+        return True
+    return len(buffer) >= AUTHWALL_SCAN_BYTES and b"</head>" in buffer
+
+
+def drain_worthwhile(content_length: Optional[str]) -> bool:
+    """Return True if finishing a body of this declared length beats reconnecting."""
+
+    return bool(content_length and content_length.isdigit() and int(content_length) <= DRAIN_LIMIT)
+
+
+def is_authwall_or_login(final_url: str, text: str) -> bool:
+    """Return True if a 200 response is actually LinkedIn's sign-in wall."""
+
+    target_url = final_url.lower()
+    if "authwall" in target_url or "/login" in target_url or "/checkpoint/" in target_url:
+        return True
+    text = text[:AUTHWALL_SCAN_CHARS].lower()
+    return ("sign in" in text and "linkedin" in text and "session_key" in text)
+
+
+def error_result(error: str) -> Dict[str, Optional[str]]:
+    """Return the result shape used when no headline could be read."""
+
+    return {
+        "name_from_page": None,
+        "title": None,
+        "company": None,
+        "error": error,
+    }
+
+
+def unchanged_result(etag: Optional[str], last_modified: Optional[str]) -> Dict[str, Any]:
+    """Return the result shape used when the server answered 304 Not Modified."""
+
+    return {
+        "name_from_page": None,
+        "title": None,
+        "company": None,
+        "error": None,
+        "unchanged": True,
+        "etag": etag,
+        "last_modified": last_modified,
+    }
+
+
+def conditional_headers(etag: Optional[str], last_modified: Optional[str]) -> Dict[str, str]:
+    """Build the If-None-Match / If-Modified-Since headers for a conditional GET."""
+
+    headers: Dict[str, str] = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def fetch_public_headline(
+    profile_url: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+) -> Dict[str, Any]:
     """Fetch the public headline information from a LinkedIn profile.
 
     Parameters
     ----------
     profile_url:
         The publicly accessible LinkedIn profile URL.
+    etag, last_modified:
+        Validators from the previous successful fetch, if any. When the
+        server answers 304 Not Modified, the page is neither downloaded nor
+        parsed.
+    session:
+        Session to send the request through; defaults to the shared
+        keep-alive `SESSION`, which every caller should normally reuse.
 
     Returns
     -------
     dict
-        A dictionary containing parsed headline components or error details.
+        A dictionary containing parsed headline components or error details,
+        plus the response's `etag` and `last_modified` validators. A 304
+        returns `unchanged_result` instead, with `unchanged` set to True.
     """
 
-    headers = {
-        "User-Agent": USER_AGENT,
-        # Be explicit to receive the standard public HTML rendition
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Connection": "close",
-        # Hint that this request originates from the open web (reduces authwall)
-        "Referer": "https://www.google.com/",
-    }
-    
-    def append_query_param(url: str, key: str, value: str) -> str:
-        parsed = urlparse(url)
-        query = dict(parse_qsl(parsed.query, keep_blank_values=True))
-        if key not in query:
-            query[key] = value
-        new_query = urlencode(query)
-        return urlunparse((parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment))
-
-    def is_authwall_or_login(resp: requests.Response) -> bool:
-        try:
-            target_url = resp.url.lower()
-        except Exception:
-            target_url = ""
-        if "authwall" in target_url or "/login" in target_url or "/checkpoint/" in target_url:
-            return True
-        text = resp.text[:5000].lower() if isinstance(resp.text, str) else ""
-        return ("sign in" in text and "linkedin" in text and "session_key" in text)
-
-    candidate_urls = [
-        profile_url,
-        append_query_param(profile_url, "trk", "public_profile"),
-        append_query_param(profile_url, "trk", "public_profile_browsemap"),
-    ]
-
+    headers = conditional_headers(etag, last_modified)
+    session = session or SESSION
     response: Optional[requests.Response] = None
+    html = ""
     last_error: Optional[str] = None
-    for candidate in candidate_urls:
-        # Gentle retry once for transient 5xx errors; no evasion
-        for attempt in range(2):
-            try:
-                resp_try = requests.get(candidate, headers=headers, timeout=15)
-            except requests.RequestException as exc:  # pragma: no cover - network failure path
-                last_error = f"network_error:{exc.__class__.__name__}"
-                resp_try = None
-                break
-            if resp_try.status_code == 200:
-                if is_authwall_or_login(resp_try):
-                    last_error = "authwall"
-                    resp_try = None
-                    break
-                response = resp_try
-                last_error = None
-                break
-            if attempt == 0 and resp_try.status_code in {500, 502, 503, 504}:
-                time.sleep(1.0)
+    for candidate in candidate_urls(profile_url):
+        try:
+            with session.get(candidate, headers=headers, timeout=15, stream=True) as resp_try:
+                if resp_try.status_code == 200:
+                    buffer = bytearray()
+                    for chunk in resp_try.iter_content(8192):
+                        buffer += chunk
+                        if head_read_complete(buffer):
+                            break
+                    if drain_worthwhile(resp_try.headers.get("Content-Length")):
+                        resp_try.raw.drain_conn()
+        except requests.RequestException as exc:  # pragma: no cover - network failure path
+            last_error = f"network_error:{exc.__class__.__name__}"
+            continue
+        if resp_try.status_code == 304:
+            return unchanged_result(etag, last_modified)
+        if resp_try.status_code == 200:
+            html = buffer.decode(resp_try.encoding or "utf-8", errors="replace")
+            if is_authwall_or_login(resp_try.url or "", html):
+                last_error = "authwall"
                 continue
-            if resp_try.status_code == 999:
-                last_error = "blocked_999"
-            else:
-                last_error = f"bad_status:{resp_try.status_code}"
-            resp_try = None
-            break
-        if response is not None:
+            response = resp_try
+            last_error = None
             break
+        if resp_try.status_code == 999:
+            last_error = "blocked_999"
+        else:
+            last_error = f"bad_status:{resp_try.status_code}"
 
     if response is None:
-        return {
-            "name_from_page": None,
-            "title": None,
-            "company": None,
-            "error": last_error or "request_failed",
-        }
-
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    def split_headline_text(text: str) -> tuple[Optional[str], Optional[str], Optional[str]]:
-        t = text.strip()
-        # Trim common suffixes
-        for suffix in ("| LinkedIn", "| LinkedIn Profile", "| Professional Profile | LinkedIn"):
+        return error_result(last_error or "request_failed")
+
+    result: Dict[str, Any] = parse_public_headline(html)
+    result["etag"] = response.headers.get("ETag")
+    result["last_modified"] = response.headers.get("Last-Modified")
+    return result
+
+
+def fetch_many(
+    people: Sequence[Any],
+    workers: int,
+    delay_seconds: float,
+    session: Optional[requests.Session] = None,
+) -> Iterator[Tuple[Any, Any]]:
+    """Fetch headlines for many people on a thread pool.
+
+    `people` are rows with `profile_url`, `etag` and `last_modified` keys.
+    Yields `(person, result)` pairs as fetches complete; `result` is the
+    raised exception when a fetch fails unexpectedly. Request starts per host
+    are spaced by `delay_seconds`. Every fetch goes through `session`
+    (default `SESSION`), so its pooled connections are reused across people.
+    """
+
+    if not people:
+        return
+
+    limiter = HostRateLimiter(delay_seconds)
+    stopped = threading.Event()
+
+    def fetch(person: Any) -> Dict[str, Any]:
+        url = person["profile_url"]
+        limiter.acquire(url)
+        if stopped.is_set():
+            raise CancelledError
+        started = time.monotonic()
+        result = fetch_public_headline(url, person["etag"], person["last_modified"], session)
+        limiter.observe(url, time.monotonic() - started, ok=not result.get("error"))
+        return result
+
+    # Closing the generator early (Ctrl-C, a failed consumer) must not wait
+    # for the remaining queue: pending fetches are cancelled, and workers
+    # already waiting on the throttle return without making their request.
+    executor = ThreadPoolExecutor(max_workers=min(workers, len(people)))
+    try:
+        futures = {executor.submit(fetch, person): person for person in people}
+        for future in as_completed(futures):
+            try:
+                outcome: Any = future.result()
+            except Exception as exc:  # pragma: no cover - defensive catch
+                outcome = exc
+            yield futures[future], outcome
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Site suffixes trimmed from headline text, in the order they are stripped
+_HEADLINE_SUFFIXES = ("| LinkedIn", "| LinkedIn Profile", "| Professional Profile | LinkedIn")
+
+
+def _split_headline_text(text: str) -> tuple[Optional[str], Optional[str], Optional[str]]:
+    t = text.strip()
+    # Trim common suffixes; one tuple endswith skips the loop for most text
+    if t.endswith(_HEADLINE_SUFFIXES):
+        for suffix in _HEADLINE_SUFFIXES:
             if t.endswith(suffix):
                 t = t[: -len(suffix)].strip()
-        # Prefer hyphen delimiter, then fall back to pipe
-        parts = [p.strip() for p in t.split(" - ") if p.strip()]
-        if len(parts) <= 1 and "|" in t:
-            parts = [p.strip() for p in t.split("|") if p.strip()]
-        name: Optional[str] = None
-        title: Optional[str] = None
-        company: Optional[str] = None
-        if parts:
-            name = parts[0]
-        if len(parts) == 2:
-            # Sometimes the second part contains "Title at Company"
-            p = parts[1]
-            if " at " in p:
-                before, after = p.split(" at ", 1)
-                title = before.strip() or None
-                company = after.strip() or None
-            else:
-                title = p
-        elif len(parts) >= 3:
-            title = " - ".join(parts[1:-1]) or None
-            company = parts[-1]
-        return name or None, title or None, company or None
-
-    name_from_page: Optional[str] = None
+    # Prefer hyphen delimiter, then fall back to pipe; each part is stripped once
+    parts = [p for p in map(str.strip, t.split(" - ")) if p]
+    if len(parts) <= 1 and "|" in t:
+        parts = [p for p in map(str.strip, t.split("|")) if p]
+    name: Optional[str] = None
     title: Optional[str] = None
     company: Optional[str] = None
+    if parts:
+        name = parts[0]
+    if len(parts) == 2:
+        # Sometimes the second part contains "Title at Company"
+        p = parts[1]
+        if " at " in p:
+            before, after = p.split(" at ", 1)
+            title = before.strip() or None
+            company = after.strip() or None
+        else:
+            title = p
+    elif len(parts) >= 3:
+        title = " - ".join(parts[1:-1]) or None
+        company = parts[-1]
+    return name or None, title or None, company or None
 
-    # Primary: og:title
-    meta_tag = soup.find("meta", attrs={"property": "og:title"})
-    if meta_tag and meta_tag.get("content"):
-        name_from_page, title, company = split_headline_text(meta_tag["content"]) 
+
+# Node filters for the JSON-LD lookups, built once rather than per page
+_LD_JSON_SELECTOR = 'script[type="application/ld+json"]'
+_LD_JSON_ATTRS = {"type": "application/ld+json"}
+
+# Only these tags are ever read, so the bs4 fallback skips building the rest
+_HEAD_STRAINER = (
+    SoupStrainer(["meta", "title", "script"]) if LexborHTMLParser is None else None
+)
+
+
+class _PageHead(NamedTuple):
+    """Headline sources of a parsed page.
+
+    The meta tags are collected up front because every lookup starts with
+    them; the `<title>` text and JSON-LD bodies are only looked up when the
+    fallbacks get that far.
+    """
+
+    metas: Dict[str, str]
+    page_title: Callable[[], Optional[str]]
+    ld_json: Callable[[], List[str]]
+
+
+def _parse_head_selectolax(html: str) -> _PageHead:
+    tree = LexborHTMLParser(html)
+    metas: Dict[str, str] = {}
+    for node in tree.css("meta"):
+        attrs = node.attributes
+        content = attrs.get("content")
+        if not content:
+            continue
+        for attr in ("property", "name"):
+            key = attrs.get(attr)
+            if key and key not in metas:
+                metas[key] = content
+
+    def page_title() -> Optional[str]:
+        title_node = tree.css_first("title")
+        return (title_node.text() if title_node is not None else None) or None
+
+    def ld_json() -> List[str]:
+        return [node.text() for node in tree.css(_LD_JSON_SELECTOR)]
+
+    return _PageHead(metas, page_title, ld_json)
+
+
+def _parse_head_bs4(html: str) -> _PageHead:
+    soup = BeautifulSoup(html, "lxml", parse_only=_HEAD_STRAINER)
+    metas: Dict[str, str] = {}
+    for tag in soup.find_all("meta"):
+        content = tag.get("content")
+        if not content:
+            continue
+        for attr in ("property", "name"):
+            key = tag.get(attr)
+            if key and key not in metas:
+                metas[key] = content
+
+    def page_title() -> Optional[str]:
+        return (soup.title.string if soup.title else None) or None
+
+    def ld_json() -> List[str]:
+        return [
+            script.text
+            for script in soup.find_all("script", attrs=_LD_JSON_ATTRS)
+        ]
+
+    return _PageHead(metas, page_title, ld_json)
+
+
+def _parse_head(html: str) -> _PageHead:
+    """Parse the page once and expose the sources the headline is read from.
+
+    Meta tag contents are keyed by `property`/`name` (first non-empty value
+    wins). Uses selectolax when installed, otherwise BeautifulSoup with lxml
+    restricted to `<meta>`, `<title>` and `<script>` tags.
+    """
+
+    if LexborHTMLParser is not None:
+        return _parse_head_selectolax(html)
+    return _parse_head_bs4(html)
+
+
+def _apply_fallbacks(
+    head: _PageHead,
+    name_from_page: Optional[str],
+    title: Optional[str],
+    company: Optional[str],
+) -> tuple[Optional[str], Optional[str], Optional[str]]:
+    """Fill missing headline fields from the secondary sources, in order."""
+
+    metas = head.metas
 
     # Fallback: twitter:title (often mirrors page title)
     if not title:
-        tw_title = soup.find("meta", attrs={"name": "twitter:title"}) or soup.find(
-            "meta", attrs={"property": "twitter:title"}
-        )
-        if tw_title and tw_title.get("content"):
-            n2, t2, c2 = split_headline_text(tw_title["content"]) 
+        tw_title = metas.get("twitter:title")
+        if tw_title:
+            n2, t2, c2 = _split_headline_text(tw_title)
             name_from_page = name_from_page or n2
             title = title or t2
             company = company or c2
 
     # Fallback: og:description / meta description (if contains expected pattern)
     if not title and not company:
-        desc_tag = soup.find("meta", attrs={"property": "og:description"}) or soup.find(
-            "meta", attrs={"name": "description"}
-        )
-        if desc_tag and desc_tag.get("content") and " - " in desc_tag["content"]:
-            n2, t2, c2 = split_headline_text(desc_tag["content"])
+        desc = metas.get("og:description") or metas.get("description")
+        if desc and " - " in desc:
+            n2, t2, c2 = _split_headline_text(desc)
             name_from_page = name_from_page or n2
             title = title or t2
             company = company or c2
 
     # Fallback: twitter:description
     if not title and not company:
-        tw_desc = soup.find("meta", attrs={"name": "twitter:description"}) or soup.find(
-            "meta", attrs={"property": "twitter:description"}
-        )
-        if tw_desc and tw_desc.get("content"):
-            n2, t2, c2 = split_headline_text(tw_desc["content"]) 
+        tw_desc = metas.get("twitter:description")
+        if tw_desc:
+            n2, t2, c2 = _split_headline_text(tw_desc)
             name_from_page = name_from_page or n2
             title = title or t2
             company = company or c2
 
     # Fallback: JSON-LD Person schema if present
     if not title and not company:
-        for script in soup.find_all("script", attrs={"type": "application/ld+json"}):
+        for script_text in head.ld_json():
+            # Only Person objects are read; skip decoding any other blob
+            if '"Person"' not in script_text:
+                continue
             try:
-                data = json.loads(script.text)
+                data = _json_loads(script_text)
             except Exception:
                 continue
             # LinkedIn may embed dictionaries or lists
@@ -214,19 +525,36 @@ def fetch_public_headline(profile_url: str) -> Dict[str, Optional[str]]:
 
     # Fallback: <title> element text
     if not title and not company:
-        if soup.title and soup.title.string:
-            n2, t2, c2 = split_headline_text(soup.title.string)
+        page_title = head.page_title()
+        if page_title:
+            n2, t2, c2 = _split_headline_text(page_title)
             name_from_page = name_from_page or n2
             title = title or t2
             company = company or c2
 
+    return name_from_page, title, company
+
+
+def parse_public_headline(html: str) -> Dict[str, Optional[str]]:
+    """Extract name, title and company from a public profile page's HTML."""
+
+    head = _parse_head(html)
+
+    name_from_page: Optional[str] = None
+    title: Optional[str] = None
+    company: Optional[str] = None
+
+    # Primary: og:title
+    og_title = head.metas.get("og:title")
+    if og_title:
+        name_from_page, title, company = _split_headline_text(og_title)
+
+    # Fallbacks only run while a field is still missing
+    if not (name_from_page and title and company):
+        name_from_page, title, company = _apply_fallbacks(head, name_from_page, title, company)
+
     if not any([name_from_page, title, company]):
-        return {
-            "name_from_page": None,
-            "title": None,
-            "company": None,
-            "error": "no_public_headline",
-        }
+        return error_result("no_public_headline")
 
     return {
         "name_from_page": name_from_page,
@@ -235,3 +563,20 @@ def fetch_public_headline(profile_url: str) -> Dict[str, Optional[str]]:
         "error": None,
     }
 
+
+def cached_fetch(
+    profile_url: str,
+    ttl: dt.timedelta = DEFAULT_CACHE_TTL,
+    *,
+    force_refresh: bool = False,
+) -> Dict[str, Optional[str]]:
+    """Return a cached headline younger than `ttl`, fetching on a miss or expiry."""
+
+    if not force_refresh:
+        cached = get_cached_headline(profile_url, ttl)
+        if cached is not None:
+            return cached
+    result = fetch_public_headline(profile_url)
+    if result.get("error") in CACHEABLE_ERRORS:
+        save_cached_headline(profile_url, result)
+    return result
@@ -0,0 +1,166 @@
+"""asyncio/aiohttp variant of the LinkedIn public profile fetcher.
+
+The same compliance rules as `scraper_public` apply: public pages only, no
+login, no cookie reuse, no CAPTCHA solving, no proxy rotation. Only the HTTP
+round-trip is asynchronous; parsing reuses `scraper_public.parse_public_headline`
+so both fetchers return identical results.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+import aiohttp
+
+from scraper_public import (
+    REQUEST_HEADERS,
+    RETRY_STATUSES,
+    candidate_urls,
+    conditional_headers,
+    drain_worthwhile,
+    error_result,
+    head_read_complete,
+    is_authwall_or_login,
+    parse_public_headline,
+    unchanged_result,
+)
+from throttle import AsyncHostRateLimiter
+
+
+# Number of people fetched per asyncio.gather batch in fetch_many
+BATCH_SIZE = 64
+
+# Connection pool bounds shared by every fetch on a session
+CONNECTION_LIMIT = 64
+CONNECTION_LIMIT_PER_HOST = 4
+
+_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+
+def new_session() -> aiohttp.ClientSession:
+    """Create a client session with the fetcher's connection limits.
+
+    Must be called from within a running event loop.
+    """
+
+    connector = aiohttp.TCPConnector(
+        limit=CONNECTION_LIMIT, limit_per_host=CONNECTION_LIMIT_PER_HOST
+    )
+    # DummyCookieJar keeps requests stateless, matching the synchronous fetcher
+    return aiohttp.ClientSession(
+        connector=connector, timeout=_TIMEOUT, cookie_jar=aiohttp.DummyCookieJar()
+    )
+
+
+async def fetch_public_headline_async(
+    session: aiohttp.ClientSession,
+    profile_url: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Asynchronously fetch the public headline information from a LinkedIn profile.
+
+    Mirrors `scraper_public.fetch_public_headline`, including the candidate
+    URL order, single 5xx retry, error codes and conditional GET handling.
+    """
+
+    headers = {**REQUEST_HEADERS, **conditional_headers(etag, last_modified)}
+    html: Optional[str] = None
+    validators: Dict[str, Optional[str]] = {}
+    last_error: Optional[str] = None
+    for candidate in candidate_urls(profile_url):
+        # Gentle retry once for transient 5xx errors; no evasion
+        for attempt in range(2):
+            try:
+                async with session.get(candidate, headers=headers) as resp:
+                    status = resp.status
+                    if status == 200:
+                        buffer = bytearray()
+                        async for chunk in resp.content.iter_chunked(8192):
+                            buffer += chunk
+                            if head_read_complete(buffer):
+                                break
+                        if drain_worthwhile(resp.headers.get("Content-Length")):
+                            await resp.read()
+                        text = buffer.decode(resp.charset or "utf-8", errors="replace")
+                        final_url = str(resp.url)
+                        validators = {
+                            "etag": resp.headers.get("ETag"),
+                            "last_modified": resp.headers.get("Last-Modified"),
+                        }
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:  # pragma: no cover - network failure path
+                last_error = f"network_error:{exc.__class__.__name__}"
+                break
+            if status == 304:
+                return unchanged_result(etag, last_modified)
+            if status == 200:
+                if is_authwall_or_login(final_url, text):
+                    last_error = "authwall"
+                    break
+                html = text
+                last_error = None
+                break
+            if attempt == 0 and status in RETRY_STATUSES:
+                await asyncio.sleep(1.0)
+                continue
+            if status == 999:
+                last_error = "blocked_999"
+            else:
+                last_error = f"bad_status:{status}"
+            break
+        if html is not None:
+            break
+
+    if html is None:
+        return error_result(last_error or "request_failed")
+
+    result: Dict[str, Any] = parse_public_headline(html)
+    result.update(validators)
+    return result
+
+
+def fetch_many(people: Sequence[Any], delay_seconds: float) -> Iterator[Tuple[Any, Any]]:
+    """Fetch headlines for many people with aiohttp on one event loop.
+
+    A synchronous generator counterpart of `scraper_public.fetch_many`:
+    yields `(person, result)` pairs one gathered batch at a time, with the
+    raised exception as `result` for failed fetches. A single loop and
+    session are kept for the whole run so keep-alive connections and
+    per-host spacing carry over between batches. Safe to call from any
+    thread without a running event loop.
+    """
+
+    if not people:
+        return
+
+    limiter = AsyncHostRateLimiter(delay_seconds)
+
+    async def fetch(session: aiohttp.ClientSession, person: Any) -> Dict[str, Any]:
+        url = person["profile_url"]
+        await limiter.acquire(url)
+        started = time.monotonic()
+        result = await fetch_public_headline_async(
+            session, url, person["etag"], person["last_modified"]
+        )
+        limiter.observe(url, time.monotonic() - started, ok=not result.get("error"))
+        return result
+
+    async def open_session() -> aiohttp.ClientSession:
+        return new_session()
+
+    async def fetch_batch(session: aiohttp.ClientSession, batch: Sequence[Any]) -> list[Any]:
+        return await asyncio.gather(
+            *(fetch(session, person) for person in batch),
+            return_exceptions=True,
+        )
+
+    with asyncio.Runner() as runner:
+        session = runner.run(open_session())
+        try:
+            for start in range(0, len(people), BATCH_SIZE):
+                batch = people[start : start + BATCH_SIZE]
+                yield from zip(batch, runner.run(fetch_batch(session, batch)))
+        finally:
+            runner.run(session.close())
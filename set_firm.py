@@ -41,7 +41,7 @@ def main(argv: list[str] | None = None) -> int:
         print("Updated 1 record by id.")
         return 0
 
-    # Update by URL (may affect multiple rows if duplicates exist)
+    # Update by URL (profile URLs are unique, so at most one row)
     try:
         updated = update_person_firm_by_url(args.url, firm_value)  # type: ignore[arg-type]
     except Exception as exc:
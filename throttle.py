@@ -0,0 +1,121 @@
+"""Politeness controls for outbound profile requests.
+
+Fetches may run concurrently, but request starts against any one host are
+still spaced by the configured delay so the public-only, throttled access
+pattern is preserved. The spacing adapts to observed latency (AutoThrottle)
+but never drops below the configured delay.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+from urllib.parse import urlparse
+
+
+# AutoThrottle aims for this many requests in flight per host
+AUTOTHROTTLE_TARGET_CONCURRENCY = 1.0
+
+# Upper bound (seconds) for an adapted per-host delay
+AUTOTHROTTLE_MAX_DELAY = 60.0
+
+
+def autothrottle_delay(current: float, latency: float, ok: bool, floor: float) -> float:
+    """Return the next per-host delay after a response that took `latency` seconds.
+
+    Moves halfway towards `latency / AUTOTHROTTLE_TARGET_CONCURRENCY` (jumping
+    straight there when that is higher), clamped to [floor, AUTOTHROTTLE_MAX_DELAY].
+    Failed responses may raise the delay but never lower it.
+    """
+
+    target = latency / AUTOTHROTTLE_TARGET_CONCURRENCY
+    delay = min(max(floor, target, (current + target) / 2), AUTOTHROTTLE_MAX_DELAY)
+    if not ok and delay < current:
+        return current
+    return delay
+
+
+class HostRateLimiter:
+    """Allow at most one request start per host every `delay` seconds.
+
+    Each host has a semaphore. `acquire` takes it and schedules a timer that
+    releases it again after the delay (plus a small random jitter), so
+    concurrency is bounded by politeness rather than by a serial sleep.
+    Reporting each response through `observe` adapts the host's delay, with
+    `delay_seconds` as its floor; a zero delay disables throttling entirely.
+    """
+
+    def __init__(self, delay_seconds: float, jitter_seconds: float = 0.6) -> None:
+        self.delay_seconds = delay_seconds
+        self.jitter_seconds = jitter_seconds
+        self._lock = threading.Lock()
+        self._hosts: dict[str, threading.Semaphore] = {}
+        self._delays: dict[str, float] = {}
+
+    def _semaphore_for(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            semaphore = self._hosts.get(host)
+            if semaphore is None:
+                semaphore = threading.Semaphore(1)
+                self._hosts[host] = semaphore
+            return semaphore
+
+    def acquire(self, url: str) -> None:
+        """Block until a request to the URL's host may start."""
+
+        host = urlparse(url).netloc.lower()
+        semaphore = self._semaphore_for(host)
+        semaphore.acquire()
+        if not self.delay_seconds:
+            semaphore.release()
+            return
+        delay = self._delays.get(host, self.delay_seconds)
+        pause = delay + random.uniform(0.0, self.jitter_seconds)
+        timer = threading.Timer(pause, semaphore.release)
+        timer.daemon = True
+        timer.start()
+
+    def observe(self, url: str, latency: float, ok: bool) -> None:
+        """Adapt the URL host's delay to a response that took `latency` seconds."""
+
+        if not self.delay_seconds:
+            return
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            current = self._delays.get(host, self.delay_seconds)
+            self._delays[host] = autothrottle_delay(current, latency, ok, self.delay_seconds)
+
+
+class AsyncHostRateLimiter:
+    """asyncio counterpart of `HostRateLimiter` for use inside one event loop."""
+
+    def __init__(self, delay_seconds: float, jitter_seconds: float = 0.6) -> None:
+        self.delay_seconds = delay_seconds
+        self.jitter_seconds = jitter_seconds
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+        self._delays: dict[str, float] = {}
+
+    async def acquire(self, url: str) -> None:
+        """Wait until a request to the URL's host may start."""
+
+        host = urlparse(url).netloc.lower()
+        semaphore = self._hosts.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(1)
+            self._hosts[host] = semaphore
+        await semaphore.acquire()
+        if not self.delay_seconds:
+            semaphore.release()
+            return
+        pause = self._delays.get(host, self.delay_seconds) + random.uniform(0.0, self.jitter_seconds)
+        asyncio.get_running_loop().call_later(pause, semaphore.release)
+
+    def observe(self, url: str, latency: float, ok: bool) -> None:
+        """Adapt the URL host's delay to a response that took `latency` seconds."""
+
+        if not self.delay_seconds:
+            return
+        host = urlparse(url).netloc.lower()
+        current = self._delays.get(host, self.delay_seconds)
+        self._delays[host] = autothrottle_delay(current, latency, ok, self.delay_seconds)
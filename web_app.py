@@ -6,7 +6,8 @@ How to run:
 Then open http://127.0.0.1:8000 in your browser.
 
 Notes:
-    - Uses only Python stdlib for the web server (wsgiref).
+    - Served by waitress (multi-threaded) when installed, so pages stay
+      responsive while a refresh runs; falls back to stdlib wsgiref otherwise.
     - All scraping remains public-only and throttled; this UI simply orchestrates
       the existing modules.
 """
@@ -15,27 +16,97 @@ from __future__ import annotations
 
 import argparse
 import csv
+import datetime as dt
 import io
+import itertools
+import queue
+import sqlite3
 import sys
+import tempfile
 import time
-import random
 import threading
-from typing import Callable, Iterable, Optional
+import traceback
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional
 
-from wsgiref.simple_server import make_server
 import os
-from urllib.parse import parse_qs
+from urllib.parse import parse_qsl
 
-from db import init_db
+from db import get_conn, init_db
 from models import (
+    HISTORY_CSV_HEADER,
+    add_people_bulk,
     add_person,
     export_full_history_to_csv,
+    get_data_version,
+    iter_history_export_rows,
     list_people,
+    list_people_with_latest_change,
     update_person_firm_by_id,
-    get_latest_title_change_for_person,
+    update_http_validators,
 )
-from scraper_public import fetch_public_headline
-from diff_logic import detect_and_record_change
+from scraper_public import fetch_many, prewarm_session
+from scraper_public_async import fetch_many as fetch_many_async
+from diff_logic import detect_and_record_change, record_not_modified
+
+try:
+    from streaming_form_data import StreamingFormDataParser
+    from streaming_form_data.targets import FileTarget, ValueTarget
+except ImportError:  # pragma: no cover - fallback to the buffered multipart parser
+    StreamingFormDataParser = None
+
+
+# Most tracker writes a /run refresh groups into one transaction
+RUN_COMMIT_EVERY = 50
+
+# gzip settings for text responses: compression level, and the smallest
+# buffered body worth compressing
+GZIP_LEVEL = 6
+GZIP_MIN_BYTES = 512
+_GZIP_TYPES = ("text/html", "text/csv", "text/plain")
+
+# Request-handling threads for the waitress server
+SERVER_THREADS = 8
+
+# Largest accepted /bulk upload (the whole multipart body)
+BULK_UPLOAD_MAX_BYTES = 50 * 1024 * 1024
+
+# Chunk size for reading upload bodies from wsgi.input
+UPLOAD_READ_CHUNK = 64 * 1024
+
+# Background workers shared by all /bulk uploads; further uploads queue up
+BULK_WORKERS = 2
+
+# Rows upserted per transaction while ingesting a bulk upload
+BULK_INSERT_CHUNK = 500
+
+# Distinct firm filters whose rendered people table is kept per data version
+PEOPLE_CACHE_MAX_ENTRIES = 64
+
+# Maximum number of profile fetches in flight during a threaded /run refresh
+RUN_WORKERS = 8
+
+# Refreshes of at least this many people fetch with aiohttp on one event loop
+ASYNC_RUN_MIN_PEOPLE = 20
+
+# Upper bound on urlencoded form bodies read by the POST routes
+FORM_MAX_BYTES = 64 * 1024
+
+# History rows fetched from SQLite and sent to the client per streamed chunk
+CSV_BATCH_ROWS = 500
+
+
+# Single-pass HTML escaping for user-controlled text (names, firms, titles)
+_HTML_ESCAPE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}
+)
+
+
+def esc(value: object) -> str:
+    """HTML-escape a value for use in element text or a quoted attribute."""
+
+    return ("" if value is None else str(value)).translate(_HTML_ESCAPE)
 
 
 HTML_HEADER = """<!doctype html><html lang="en"><head>
@@ -74,6 +145,10 @@ HTML_FOOTER = """
 </body></html>
 """
 
+# Encoded once; every page is sent as header, rendered content, footer chunks
+_HEADER_BYTES = HTML_HEADER.encode("utf-8")
+_FOOTER_BYTES = HTML_FOOTER.encode("utf-8")
+
 
 class AppState:
     def __init__(self, delay_seconds: float) -> None:
@@ -89,59 +164,27 @@ class AppState:
         self.run_filter: str | None = None
 
 
-def render_home(state: AppState) -> str:
-    return (
-        HTML_HEADER
-        + f"""
+# Pages are assembled from markup precomputed at import time; renderers only
+# splice in their dynamic values.
+_HOME_PAGE_START = """
         <section>
           <p>Welcome. Use this UI to manage your watchlist and run refreshes.</p>
           <ul>
             <li><a href="/people">Add or edit people</a></li>
-            <li><a href="/run">Run tracker</a> (current delay: {state.delay_seconds:.1f}s)</li>
+            <li><a href="/run">Run tracker</a> (current delay: """
+
+_HOME_PAGE_END = """s)</li>
             <li><a href="/history.csv">Export full history CSV</a></li>
           </ul>
         </section>
         """
-        + HTML_FOOTER
-    )
 
 
-def render_people(state: AppState, message: Optional[str] = None) -> str:
-    rows = list_people()
-    table_rows = []
-    for p in rows:
-        change = get_latest_title_change_for_person(int(p["id"]))
-        if change and (change["old_title"] or change["new_title"]):
-            recent_title_change = (
-                f"'{change['old_title'] or '-'}' → '{change['new_title'] or '-'}'"
-            )
-        else:
-            recent_title_change = "N/A"
-        table_rows.append(
-            f"<tr>"
-            f"<td>{p['id']}</td>"
-            f"<td>{p['name']}</td>"
-            f"<td>{p['firm'] or '-'}</td>"
-            f"<td>{(p['last_title'] or '-') }</td>"
-            f"<td>{(p['last_company'] or '-') }</td>"
-            f"<td>{(p['last_seen'] or '-') }</td>"
-            f"<td>{recent_title_change}</td>"
-            f"<td>"
-            f"<form method=post action=/set_firm style='display:inline'>"
-            f"<input type=hidden name=id value={p['id']} />"
-            f"<input type=text name=firm placeholder=Firm value='{p['firm'] or ''}' />"
-            f" <button class=btn type=submit>Save</button>"
-            f" <button class=btn type=submit name=clear value=1>Clear</button>"
-            f"</form>"
-            f"</td>"
-            f"</tr>"
-        )
+def render_home(state: AppState) -> str:
+    return f"{_HOME_PAGE_START}{state.delay_seconds:.1f}{_HOME_PAGE_END}"
 
-    flash_html = f"<div class=flash>{message}</div>" if message else ""
-    return (
-        HTML_HEADER
-        + flash_html
-        + """
+
+_PEOPLE_TABLE_OPEN = """
         <section>
           <h2>People</h2>
           <table>
@@ -150,8 +193,8 @@ def render_people(state: AppState, message: Optional[str] = None) -> str:
             </thead>
             <tbody>
         """
-        + "".join(table_rows)
-        + """
+
+_PEOPLE_TABLE_CLOSE = """
             </tbody>
           </table>
         </section>
@@ -170,180 +213,646 @@ def render_people(state: AppState, message: Optional[str] = None) -> str:
           </form>
         </section>
         """
-        + HTML_FOOTER
-    )
 
 
-def render_run_form(state: AppState, output: Optional[str] = None) -> str:
-    # Prefer live background output when available
-    if state.run_active or state.run_output:
-        bg = "\n".join(state.run_output[-400:])
-        summary = (
-            f"Checked {state.run_total} people. {state.run_changed} changed. "
-            f"{state.run_unchanged} unchanged. {state.run_skipped} skipped."
+# Rendered people tables (UTF-8 encoded) keyed by firm filter, valid while
+# the database's change counter still equals _people_cache_version
+_people_cache: dict[Optional[str], bytes] = {}
+_people_cache_version = -1
+_people_cache_lock = threading.Lock()
+
+# Part of every /people ETag, so pages cached before a restart (possibly with
+# different markup or a different database) are never revalidated as current
+_BOOT_ID = format(time.time_ns(), "x")
+
+
+def _people_row(p: sqlite3.Row) -> str:
+    # The firm is escaped once for both its cell and the edit form's value
+    firm = esc(p["firm"])
+    if p["latest_old_title"] or p["latest_new_title"]:
+        recent_title_change = (
+            f"'{esc(p['latest_old_title'] or '-')}' → '{esc(p['latest_new_title'] or '-')}'"
         )
-        output = (output or "") + ("\n" if output else "") + summary + "\n" + bg
-    flash_html = f"<div class=flash><div class=mono>{output}</div></div>" if output else ""
+    else:
+        recent_title_change = "N/A"
     return (
-        HTML_HEADER
-        + flash_html
-        + f"""
+        f"<tr>"
+        f"<td>{p['id']}</td>"
+        f"<td>{esc(p['name'])}</td>"
+        f"<td>{firm or '-'}</td>"
+        f"<td>{esc(p['last_title'] or '-')}</td>"
+        f"<td>{esc(p['last_company'] or '-')}</td>"
+        f"<td>{esc(p['last_seen'] or '-')}</td>"
+        f"<td>{recent_title_change}</td>"
+        f"<td>"
+        f"<form method=post action=/set_firm style='display:inline'>"
+        f"<input type=hidden name=id value={p['id']} />"
+        f"<input type=text name=firm placeholder=Firm value='{firm}' />"
+        f" <button class=btn type=submit>Save</button>"
+        f" <button class=btn type=submit name=clear value=1>Clear</button>"
+        f"</form>"
+        f"</td>"
+        f"</tr>"
+    )
+
+
+def _render_people_table(firm_filter: Optional[str]) -> bytes:
+    rows = list_people_with_latest_change(firm_filter)
+    return "".join([_PEOPLE_TABLE_OPEN, *map(_people_row, rows), _PEOPLE_TABLE_CLOSE]).encode("utf-8")
+
+
+def _people_table(firm_filter: Optional[str]) -> bytes:
+    """Return the encoded people table HTML, rebuilt only after the data changed."""
+
+    global _people_cache_version
+
+    # Read the version before the rows: a write landing in between only makes
+    # the cached table newer than its key, and the next request rebuilds it.
+    version = get_data_version()
+    with _people_cache_lock:
+        if version != _people_cache_version:
+            _people_cache.clear()
+            _people_cache_version = version
+        table = _people_cache.get(firm_filter)
+    if table is None:
+        table = _render_people_table(firm_filter)
+        with _people_cache_lock:
+            if version == _people_cache_version and len(_people_cache) < PEOPLE_CACHE_MAX_ENTRIES:
+                _people_cache[firm_filter] = table
+    return table
+
+
+def _people_etag() -> str:
+    # The query string is part of the browser's cache key, so each filtered
+    # page is validated separately and the filter need not be in the tag
+    return f'W/"{_BOOT_ID}-{get_data_version()}"'
+
+
+def _etag_matches(environ: dict[str, Any], etag: str) -> bool:
+    """Weakly compare `etag` with the request's If-None-Match header."""
+
+    header = environ.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def render_people(
+    state: AppState, message: Optional[str] = None, firm_filter: Optional[str] = None
+) -> bytes:
+    # Returned encoded so the cached table is sent without re-encoding
+    if not message:
+        return _people_table(firm_filter)
+    return f"<div class=flash>{esc(message)}</div>".encode("utf-8") + _people_table(firm_filter)
+
+
+_RUN_FORM_START = """
         <section>
           <h2>Run Tracker</h2>
           <form method=post>
             <div class=grid>
-              <label for=firm>Firm filter (exact, optional)</label>
+              <label for=firm>Firm filter (case-insensitive, optional)</label>
               <input id=firm name=firm type=text />
               <label for=delay>Delay seconds</label>
-              <input id=delay name=delay type=text value="{state.delay_seconds}" />
+              <input id=delay name=delay type=text value=\""""
+
+
+def _run_form_end(active: bool) -> str:
+    return f"""" />
             </div>
             <p style="margin-top:10px">
-              <button class=btn type=submit {'disabled' if state.run_active else ''}>Run</button>
-              {'<span style="margin-left:8px">(in progress... refresh page to update)</span>' if state.run_active else ''}
+              <button class=btn type=submit {'disabled' if active else ''}>Run</button>
+              {'<span style="margin-left:8px">(in progress... refresh page to update)</span>' if active else ''}
             </p>
           </form>
         </section>
         """
-        + HTML_FOOTER
+
+
+_RUN_FORM_END_IDLE = _run_form_end(active=False)
+_RUN_FORM_END_ACTIVE = _run_form_end(active=True)
+
+
+def render_run_form(state: AppState, output: Optional[str] = None) -> str:
+    # Prefer live background output when available
+    if state.run_active or state.run_output:
+        bg = "\n".join(state.run_output[-400:])
+        summary = (
+            f"Checked {state.run_total} people. {state.run_changed} changed. "
+            f"{state.run_unchanged} unchanged. {state.run_skipped} skipped."
+        )
+        output = (output or "") + ("\n" if output else "") + summary + "\n" + bg
+    flash_html = f"<div class=flash><div class=mono>{esc(output)}</div></div>" if output else ""
+    return "".join(
+        [
+            flash_html,
+            _RUN_FORM_START,
+            str(state.delay_seconds),
+            _RUN_FORM_END_ACTIVE if state.run_active else _RUN_FORM_END_IDLE,
+        ]
     )
 
 
-def render_bulk_form(message: Optional[str] = None, output: Optional[str] = None) -> str:
-    flash = []
-    if message:
-        flash.append(f"<div class=flash>{message}</div>")
-    if output:
-        flash.append(f"<div class=flash><div class=mono>{output}</div></div>")
-    flash_html = "".join(flash)
-    sample = "url,name,firm\nhttps://www.linkedin.com/in/username1/,Jane Smith,CenterOak Partners\nhttps://www.linkedin.com/in/username2/,,\n"
-    return (
-        HTML_HEADER
-        + flash_html
-        + f"""
+_BULK_SAMPLE_CSV = "url,name,firm\nhttps://www.linkedin.com/in/username1/,Jane Smith,CenterOak Partners\nhttps://www.linkedin.com/in/username2/,,\n"
+
+_BULK_FORM_END = f"""
         <section>
           <h2>Bulk Upload (CSV)</h2>
           <p>Upload a CSV exported from Excel. Columns supported (header optional): <strong>url</strong>, <em>name</em>, <em>firm</em>. Only <strong>url</strong> is required. Large uploads are processed in the background to avoid timeouts.</p>
           <form method="post" action="/bulk" enctype="multipart/form-data">
             <input type="file" name="file" accept=".csv" required />
+            <label><input type="checkbox" name="detect" value="1" checked /> Look up missing names and current headlines after adding</label>
             <button class="btn" type="submit">Upload & Add</button>
           </form>
           <details style="margin-top:10px"><summary>CSV example</summary>
-            <pre class=mono>{sample}</pre>
+            <pre class=mono>{_BULK_SAMPLE_CSV}</pre>
           </details>
         </section>
         """
-        + HTML_FOOTER
-    )
 
 
-def app(environ, start_response):  # type: ignore[no-untyped-def]
-    # Keep a module-global state for delay seconds
-    state: AppState = environ["app.state"]
+def render_bulk_form(message: Optional[str] = None, output: Optional[str] = None) -> str:
+    flash = []
+    if message:
+        flash.append(f"<div class=flash>{esc(message)}</div>")
+    if output:
+        flash.append(f"<div class=flash><div class=mono>{esc(output)}</div></div>")
+    return "".join([*flash, _BULK_FORM_END])
+
+
+_bulk_executor = ThreadPoolExecutor(max_workers=BULK_WORKERS, thread_name_prefix="bulk")
+
+
+def _report_bulk_failure(future: Future) -> None:
+    """Print the traceback of a bulk upload that failed on `_bulk_executor`."""
+
+    exc = future.exception()
+    if exc is not None:
+        print("Bulk upload failed:", file=sys.stderr)
+        traceback.print_exception(exc, file=sys.stderr)
+
+
+def _read_form(environ: dict[str, Any], max_bytes: int = FORM_MAX_BYTES) -> dict[str, str]:
+    """Read and parse a urlencoded request body, reading at most `max_bytes`."""
+
+    try:
+        size = min(int(environ.get("CONTENT_LENGTH") or 0), max_bytes)
+    except ValueError:
+        size = 0
+    body = environ["wsgi.input"].read(size) if size > 0 else b""
+    return dict(parse_qsl(body.decode("utf-8", "replace"), keep_blank_values=True))
+
+
+def _iter_body(environ: dict[str, Any], size: int) -> Iterator[bytes]:
+    """Yield the request body in chunks, stopping after `size` bytes."""
 
-    path = environ.get("PATH_INFO", "/") or "/"
-    method = environ.get("REQUEST_METHOD", "GET").upper()
+    stream = environ["wsgi.input"]
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(min(UPLOAD_READ_CHUNK, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        yield chunk
 
-    def respond(
-        status: str,
-        body: str,
-        content_type: str = "text/html; charset=utf-8",
-        extra_headers: list[tuple[str, str]] | None = None,
-    ):
-        data = body.encode("utf-8")
-        headers = [("Content-Type", content_type), ("Content-Length", str(len(data)))]
-        if extra_headers:
-            headers.extend(extra_headers)
-        start_response(status, headers)
-        return [data]
 
-    # Routes
-    if method == "GET" and path == "/":
-        return respond("200 OK", render_home(state))
+def _spool_upload_streaming(
+    environ: dict[str, Any], content_type: str, size: int, csv_path: str
+) -> tuple[bool, bool]:
+    """Stream the multipart body's `file` part to `csv_path`.
 
-    if method == "GET" and path == "/people":
-        return respond("200 OK", render_people(state))
+    Returns whether a file part was present and whether `detect` was set.
+    Memory stays at one read chunk regardless of the upload size.
+    """
 
-    if method == "POST" and path == "/add":
+    file_target = FileTarget(csv_path)
+    detect_target = ValueTarget()
+    parser = StreamingFormDataParser(headers={"Content-Type": content_type})
+    parser.register("file", file_target)
+    parser.register("detect", detect_target)
+    try:
+        for chunk in _iter_body(environ, size):
+            parser.data_received(chunk)
+    except Exception as exc:
+        raise ValueError(f"Malformed multipart body: {exc}") from exc
+    return file_target.multipart_filename is not None, bool(detect_target.value)
+
+
+def _spool_upload_buffered(
+    environ: dict[str, Any], boundary: str, size: int, csv_path: str
+) -> tuple[bool, bool]:
+    """Minimal multipart/form-data parser (no cgi) used without streaming_form_data.
+
+    Reads the whole body into memory; same contract as `_spool_upload_streaming`.
+    """
+
+    raw_body = b"".join(_iter_body(environ, size))
+    delim = ("--" + boundary).encode()
+    # Walk the delimiters with find() and keep offsets rather than splitting
+    # the body into copied parts; the file part is written out through a view.
+    file_span: tuple[int, int] | None = None
+    detect = False
+    start = raw_body.find(delim)
+    while start != -1:
+        start += len(delim)
+        end = raw_body.find(delim, start)
+        next_start = end
+        if end == -1:
+            end = len(raw_body)
+        while start < end and raw_body[start] in b"\r\n":
+            start += 1
+        header_end = raw_body.find(b"\r\n\r\n", start, end)
+        if start < end and not raw_body.startswith(b"--", start, end) and header_end != -1:
+            headers_blob = raw_body[start:header_end].decode("utf-8", errors="ignore")
+            content_start, content_end = header_end + 4, end
+            # trim trailing CRLF if present
+            if raw_body.endswith(b"\r\n", content_start, content_end):
+                content_end -= 2
+            dispo_line = next((h for h in headers_blob.split("\r\n") if h.lower().startswith("content-disposition:")), "")
+            if "name=\"file\"" in dispo_line:
+                file_span = (content_start, content_end)
+            elif "name=\"detect\"" in dispo_line:
+                detect = True
+        start = next_start
+    if file_span is None:
+        return False, detect
+    with open(csv_path, "wb") as fp, memoryview(raw_body) as view:
+        fp.write(view[file_span[0] : file_span[1]])
+    return True, detect
+
+
+def respond(
+    start_response: Callable,
+    status: str,
+    body: str | bytes,
+    content_type: str = "text/html; charset=utf-8",
+    extra_headers: list[tuple[str, str]] | None = None,
+) -> list[bytes]:
+    data = body if isinstance(body, bytes) else body.encode("utf-8")
+    headers = [("Content-Type", content_type), ("Content-Length", str(len(data)))]
+    if extra_headers:
+        headers.extend(extra_headers)
+    start_response(status, headers)
+    return [data]
+
+
+def respond_page(
+    start_response: Callable,
+    status: str,
+    content: str | bytes,
+    extra_headers: list[tuple[str, str]] | None = None,
+) -> list[bytes]:
+    # Wrap rendered page content in the pre-encoded header and footer
+    data = content if isinstance(content, bytes) else content.encode("utf-8")
+    size = len(_HEADER_BYTES) + len(data) + len(_FOOTER_BYTES)
+    headers = [("Content-Type", "text/html; charset=utf-8"), ("Content-Length", str(size))]
+    if extra_headers:
+        headers.extend(extra_headers)
+    start_response(status, headers)
+    return [_HEADER_BYTES, data, _FOOTER_BYTES]
+
+
+def _stream_history() -> Iterator[bytes]:
+    """Yield /history.csv in batches straight from the export cursor."""
+
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(HISTORY_CSV_HEADER)
+    yield output.getvalue().encode("utf-8")
+    cursor = iter_history_export_rows()
+    # The connection is pooled per thread; only the cursor is released,
+    # including when the client disconnects and the server closes us early.
+    try:
+        while batch := cursor.fetchmany(CSV_BATCH_ROWS):
+            output.seek(0)
+            output.truncate()
+            writer.writerows(batch)
+            yield output.getvalue().encode("utf-8")
+    finally:
+        cursor.close()
+
+
+def _ingest_bulk_upload(csv_path: str, delay_seconds: float, detect: bool) -> None:
+    """Add the people in an uploaded CSV, then optionally look up their headlines."""
+
+    # Rows go in with no network I/O: the URL stands in for a missing
+    # name until the optional lookup below fills it from the page.
+    added_urls: set[str] = set()
+    unnamed: dict[str, str] = {}
+    pending: list[dict[str, Any]] = []
+
+    def flush_pending() -> None:
         try:
-            size = int(environ.get("CONTENT_LENGTH") or 0)
-        except ValueError:
-            size = 0
-        body = environ["wsgi.input"].read(size).decode("utf-8")
-        form = parse_qs(body)
-        name = (form.get("name", [""])[0] or "").strip()
-        firm = (form.get("firm", [""])[0] or "").strip() or None
-        url = (form.get("url", [""])[0] or "").strip()
+            add_people_bulk(pending)
+            added_urls.update(item["profile_url"] for item in pending)
+        except Exception as exc:
+            # One bad row (or a busy database) fails the whole chunk; retry
+            # row by row so only the rows that fail again are dropped.
+            print(
+                f"Bulk insert of {len(pending)} rows failed ({exc}); retrying one by one",
+                file=sys.stderr,
+            )
+            for item in pending:
+                try:
+                    add_person(
+                        name=item["name"], firm=item.get("firm"), profile_url=item["profile_url"]
+                    )
+                    added_urls.add(item["profile_url"])
+                except Exception as row_exc:
+                    print(f"Skipped {item['profile_url']}: {row_exc}", file=sys.stderr)
+        pending.clear()
+
+    # Rows are read one at a time straight from the spooled file, so
+    # memory is bounded by one insert chunk whatever the upload size.
+    try:
+        with open(csv_path, encoding="utf-8-sig", errors="replace", newline="") as fp:
+            reader_local = csv.reader(fp)
+            first_row = next(reader_local, None)
+            if first_row is None:
+                return
+            header_local = [h.strip().lower() for h in first_row]
+            has_header_local = (
+                "url" in header_local or "name" in header_local or "firm" in header_local
+            )
+            rows_source = (
+                reader_local if has_header_local else itertools.chain([first_row], reader_local)
+            )
+
+            def get_cols_local(row):
+                if has_header_local:
+                    mapping = {
+                        header_local[i]: (row[i].strip() if i < len(row) else "")
+                        for i in range(len(header_local))
+                    }
+                    return mapping.get("url", ""), mapping.get("name", ""), mapping.get("firm", "")
+                url = row[0].strip() if len(row) > 0 else ""
+                name = row[1].strip() if len(row) > 1 else ""
+                firm = row[2].strip() if len(row) > 2 else ""
+                return url, name, firm
+
+            for row in rows_source:
+                if not row or all((cell or "").strip() == "" for cell in row):
+                    continue
+                url, name, firm = get_cols_local(row)
+                if not url.lower().startswith("http"):
+                    continue
+                if not name:
+                    unnamed[url] = firm
+                pending.append({"name": name or url, "firm": firm or None, "profile_url": url})
+                if len(pending) >= BULK_INSERT_CHUNK:
+                    flush_pending()
+    finally:
+        # Rows read before a failure (e.g. an oversized CSV field) still go in
+        if pending:
+            flush_pending()
+        os.unlink(csv_path)
+
+    if not detect or not added_urls:
+        return
+
+    # Auto-run tracker for newly added profiles; the same fetch names
+    # people the CSV left unnamed. Fetches overlap on fetch_many's pool
+    # while its per-host limiter keeps the configured spacing.
+    people_new = [p for p in list_people() if p["profile_url"] in added_urls]
+    for person, result in fetch_many(people_new, RUN_WORKERS, delay_seconds):
+        if isinstance(result, BaseException) or result.get("unchanged"):
+            continue
+        error = result.get("error")
+        observed_title = result.get("title")
+        observed_company = result.get("company")
+        if not error and person["profile_url"] in unnamed:
+            page_name = (result.get("name_from_page") or "").strip()
+            if page_name:
+                firm = unnamed[person["profile_url"]] or (observed_company or "").strip()
+                try:
+                    add_person(name=page_name, firm=firm or None, profile_url=person["profile_url"])
+                except Exception:
+                    pass
+        if error or (observed_title is None and observed_company is None):
+            continue
+        try:
+            detect_and_record_change(person, observed_title, observed_company)
+            update_http_validators(person["id"], result.get("etag"), result.get("last_modified"))
+        except Exception:
+            continue
+
+
+class WSGIApp:
+    """The web UI as a WSGI callable bound to one `AppState`.
+
+    Requests dispatch through a dict keyed by (method, path); anything not
+    listed gets the 404 page.
+    """
+
+    def __init__(self, state: AppState) -> None:
+        self.state = state
+        self.routes: dict[tuple[str, str], Callable] = {
+            ("GET", "/"): self.home,
+            ("GET", "/people"): self.people,
+            ("POST", "/add"): self.add,
+            ("POST", "/set_firm"): self.set_firm,
+            ("GET", "/run"): self.run_form,
+            ("POST", "/run"): self.start_run,
+            ("GET", "/bulk"): self.bulk_form,
+            ("POST", "/bulk"): self.bulk_upload,
+            ("GET", "/history.csv"): self.history_csv,
+        }
+
+    def __call__(self, environ: dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        key = (environ.get("REQUEST_METHOD", "GET").upper(), environ.get("PATH_INFO") or "/")
+        return self.routes.get(key, self.not_found)(environ, start_response)
+
+    def home(self, environ: dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        return respond_page(start_response, "200 OK", render_home(self.state))
+
+    def people(self, environ: dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        query = dict(parse_qsl(environ.get("QUERY_STRING", "")))
+        firm_filter = query.get("firm", "").strip() or None
+        # Browsers revalidate on every visit (no-cache); while no write has
+        # landed since, the answer is a bodiless 304 and nothing is rendered.
+        etag = _people_etag()
+        cache_headers = [("ETag", etag), ("Cache-Control", "no-cache")]
+        if _etag_matches(environ, etag):
+            start_response("304 Not Modified", cache_headers)
+            return []
+        return respond_page(
+            start_response,
+            "200 OK",
+            render_people(self.state, firm_filter=firm_filter),
+            extra_headers=cache_headers,
+        )
+
+    def add(self, environ: dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        form = _read_form(environ)
+        name = form.get("name", "").strip()
+        firm = form.get("firm", "").strip() or None
+        url = form.get("url", "").strip()
         if not name or not url.lower().startswith("http"):
-            return respond("400 Bad Request", render_people(state, "Invalid name or URL."))
+            return respond_page(
+                start_response, "400 Bad Request", render_people(self.state, "Invalid name or URL.")
+            )
         add_person(name=name, firm=firm, profile_url=url)
         return respond(
+            start_response,
             "303 See Other",
             "",
             content_type="text/plain; charset=utf-8",
             extra_headers=[("Location", "/")],
         )
 
-    if method == "POST" and path == "/set_firm":
-        try:
-            size = int(environ.get("CONTENT_LENGTH") or 0)
-        except ValueError:
-            size = 0
-        body = environ["wsgi.input"].read(size).decode("utf-8")
-        form = parse_qs(body)
-        pid = int((form.get("id", ["0"])[0] or "0"))
-        clear = (form.get("clear", [""])[0] or "").strip() == "1"
-        firm = None if clear else ((form.get("firm", [""])[0] or "").strip() or None)
+    def set_firm(self, environ: dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        form = _read_form(environ)
+        pid = int(form.get("id") or "0")
+        clear = form.get("clear", "").strip() == "1"
+        firm = None if clear else (form.get("firm", "").strip() or None)
         update_person_firm_by_id(pid, firm)
         return respond(
+            start_response,
             "303 See Other",
             "",
             content_type="text/plain; charset=utf-8",
             extra_headers=[("Location", "/people")],
         )
 
-    if path == "/run":
-        if method == "GET":
-            return respond("200 OK", render_run_form(state))
+    def run_form(self, environ: dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        return respond_page(start_response, "200 OK", render_run_form(self.state))
+
+    def start_run(self, environ: dict[str, Any], start_response: Callable) -> Iterable[bytes]:
         # POST: start background run and redirect immediately to avoid timeouts
-        try:
-            size = int(environ.get("CONTENT_LENGTH") or 0)
-        except ValueError:
-            size = 0
-        body = environ["wsgi.input"].read(size).decode("utf-8")
-        form = parse_qs(body)
-        firm_filter = (form.get("firm", [""])[0] or "").strip() or None
-        delay_str = (form.get("delay", [""])[0] or "").strip()
+        form = _read_form(environ)
+        firm_filter = form.get("firm", "").strip() or None
+        delay_str = form.get("delay", "").strip()
         try:
             if delay_str:
-                state.delay_seconds = max(0.0, float(delay_str))
+                self.state.delay_seconds = max(0.0, float(delay_str))
         except ValueError:
             pass
 
-        def _background_run() -> None:
-            with state.run_lock:
+        # Claim the run under the lock: request threads run concurrently, so
+        # checking run_active without it could start two refreshes. If a run
+        # is already active, just redirect back.
+        state = self.state
+        with state.run_lock:
+            claimed = not state.run_active
+            if claimed:
                 state.run_active = True
                 state.run_output = []
                 state.run_changed = state.run_unchanged = state.run_skipped = 0
                 state.run_filter = firm_filter
-                people_local = list_people(firm_filter)
+                state.run_total = 0
+        if claimed:
+            threading.Thread(target=self._run_refresh, args=(firm_filter,), daemon=True).start()
+        return respond(
+            start_response,
+            "303 See Other",
+            "",
+            content_type="text/plain; charset=utf-8",
+            extra_headers=[("Location", "/run")],
+        )
+
+    def _run_refresh(self, firm_filter: Optional[str]) -> None:
+        # The caller (`start_run`) has already claimed the run and reset its state
+        state = self.state
+        # Whatever happens below, the run must end: a stuck run_active would
+        # refuse every later /run until the server restarts.
+        try:
+            people_local = list_people(firm_filter)
+            with state.run_lock:
                 state.run_total = len(people_local)
-            if state.run_total == 0:
+            if not people_local:
                 with state.run_lock:
                     state.run_output.append("No people found for that filter.")
-                    state.run_active = False
                 return
-            for idx, person in enumerate(people_local):
+            self._refresh_people(people_local)
+        except Exception as exc:
+            with state.run_lock:
+                state.run_output.append(f"[ERROR] Run aborted → {exc}")
+        finally:
+            with state.run_lock:
+                if state.run_total:
+                    state.run_output.append(
+                        f"Checked {state.run_total} people. {state.run_changed} changed. "
+                        f"{state.run_unchanged} unchanged. {state.run_skipped} skipped."
+                    )
+                state.run_active = False
+
+    def _refresh_people(self, people_local: list) -> None:
+        state = self.state
+        # Large lists are fetched on one asyncio event loop; smaller ones on
+        # a thread pool. Diffing and DB writes stay on this thread.
+        if state.run_total >= ASYNC_RUN_MIN_PEOPLE:
+            outcomes = fetch_many_async(people_local, state.delay_seconds)
+        else:
+            outcomes = fetch_many(people_local, RUN_WORKERS, state.delay_seconds)
+
+        # Fetches are drained on a helper thread so this one can see when no
+        # outcome is ready: pending writes are committed then, rather than
+        # holding the write lock (and blocking /add, /bulk) during a fetch.
+        ready: queue.Queue = queue.Queue()
+        # Set when this thread gives up, so the producer stops fetching
+        aborted = threading.Event()
+
+        def _produce() -> None:
+            try:
+                for outcome in outcomes:
+                    if aborted.is_set():
+                        break
+                    ready.put(outcome)
+            finally:
+                # Closing the generator cancels the fetches still queued
+                outcomes.close()
+                ready.put(None)
+
+        threading.Thread(target=_produce, daemon=True).start()
+        conn = get_conn()
+        pending_writes = 0
+        today_iso = dt.date.today().isoformat()
+        try:
+            while True:
+                try:
+                    item = ready.get_nowait()
+                except queue.Empty:
+                    if pending_writes:
+                        conn.commit()
+                        pending_writes = 0
+                    item = ready.get()
+                if item is None:
+                    break
+                if pending_writes >= RUN_COMMIT_EVERY:
+                    conn.commit()
+                    pending_writes = 0
+
+                person, result = item
                 person_name = person["name"]
                 firm_label = person["firm"] or "-"
-                try:
-                    result = fetch_public_headline(person["profile_url"])
-                except Exception as exc:
+                if isinstance(result, BaseException):
                     with state.run_lock:
                         state.run_skipped += 1
                         state.run_output.append(
-                            f"[SKIP] {person_name} ({firm_label}) → unexpected_error:{exc}"
+                            f"[SKIP] {person_name} ({firm_label}) → unexpected_error:{result}"
                         )
                     continue
+                if result.get("unchanged"):
+                    # 304 Not Modified: skip parsing and diffing entirely
+                    try:
+                        diff_result = record_not_modified(
+                            person, conn=conn, today_iso=today_iso
+                        )
+                    except Exception as exc:
+                        with state.run_lock:
+                            state.run_skipped += 1
+                            state.run_output.append(
+                                f"[SKIP] {person_name} ({firm_label}) → diff_error:{exc}"
+                            )
+                        continue
+                    pending_writes += 1
+                    with state.run_lock:
+                        state.run_output.append(diff_result["message"])
+                        state.run_unchanged += 1
+                    continue
                 error = result.get("error")
                 observed_title = result.get("title")
                 observed_company = result.get("company")
@@ -354,53 +863,52 @@ def app(environ, start_response):  # type: ignore[no-untyped-def]
                         state.run_output.append(
                             f"[SKIP] {person_name} ({firm_label}) → {reason}"
                         )
-                else:
-                    try:
-                        diff_result = detect_and_record_change(person, observed_title, observed_company)
-                    except Exception as exc:
-                        with state.run_lock:
-                            state.run_skipped += 1
-                            state.run_output.append(
-                                f"[SKIP] {person_name} ({firm_label}) → diff_error:{exc}"
-                            )
-                        continue
+                    continue
+                try:
+                    diff_result = detect_and_record_change(
+                        person, observed_title, observed_company, conn=conn, today_iso=today_iso
+                    )
+                    update_http_validators(
+                        person["id"], result.get("etag"), result.get("last_modified"), conn=conn
+                    )
+                except Exception as exc:
                     with state.run_lock:
-                        state.run_output.append(diff_result["message"])
-                        if diff_result["changed"]:
-                            state.run_changed += 1
-                        else:
-                            state.run_unchanged += 1
-                if idx < state.run_total - 1 and state.delay_seconds:
-                    time.sleep(state.delay_seconds + random.uniform(0.0, 0.6))
-            with state.run_lock:
-                state.run_output.append(
-                    f"Checked {state.run_total} people. {state.run_changed} changed. "
-                    f"{state.run_unchanged} unchanged. {state.run_skipped} skipped."
-                )
-                state.run_active = False
+                        state.run_skipped += 1
+                        state.run_output.append(
+                            f"[SKIP] {person_name} ({firm_label}) → diff_error:{exc}"
+                        )
+                    continue
+                pending_writes += 1
+                with state.run_lock:
+                    state.run_output.append(diff_result["message"])
+                    if diff_result["changed"]:
+                        state.run_changed += 1
+                    else:
+                        state.run_unchanged += 1
+            conn.commit()
+        except BaseException:
+            aborted.set()
+            # Writes since the last commit are lost rather than left holding
+            # the write lock on this thread's pooled connection.
+            conn.rollback()
+            raise
 
-        # If a run is already active, just redirect back.
-        if not state.run_active:
-            threading.Thread(target=_background_run, daemon=True).start()
-        return respond(
-            "303 See Other",
-            "",
-            content_type="text/plain; charset=utf-8",
-            extra_headers=[("Location", "/run")],
-        )
+    def bulk_form(self, environ: dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        return respond_page(start_response, "200 OK", render_bulk_form())
 
-    if path == "/bulk":
-        if method == "GET":
-            return respond("200 OK", render_bulk_form())
-        # POST: process CSV upload
-        # Minimal multipart/form-data parser (no cgi)
+    def bulk_upload(self, environ: dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        # POST: spool the uploaded CSV to a temp file for the background worker
         content_type = environ.get("CONTENT_TYPE", "")
         if "multipart/form-data" not in content_type:
-            return respond("400 Bad Request", render_bulk_form(message="Invalid content type."))
+            return respond_page(
+                start_response, "400 Bad Request", render_bulk_form(message="Invalid content type.")
+            )
         boundary_key = "boundary="
         boundary_index = content_type.find(boundary_key)
         if boundary_index == -1:
-            return respond("400 Bad Request", render_bulk_form(message="Missing multipart boundary."))
+            return respond_page(
+                start_response, "400 Bad Request", render_bulk_form(message="Missing multipart boundary.")
+            )
         boundary = content_type[boundary_index + len(boundary_key) :].strip()
         if boundary.startswith('"') and boundary.endswith('"'):
             boundary = boundary[1:-1]
@@ -408,171 +916,150 @@ def app(environ, start_response):  # type: ignore[no-untyped-def]
             size = int(environ.get("CONTENT_LENGTH") or 0)
         except ValueError:
             size = 0
-        raw_body = environ["wsgi.input"].read(size)
-        delim = ("--" + boundary).encode()
-        parts = raw_body.split(delim)
-        file_bytes: bytes | None = None
-        for part in parts:
-            part = part.lstrip(b"\r\n")
-            if not part or part.startswith(b"--"):
-                continue
-            header_end = part.find(b"\r\n\r\n")
-            if header_end == -1:
-                continue
-            headers_blob = part[:header_end].decode("utf-8", errors="ignore")
-            content = part[header_end + 4 :]
-            # trim trailing CRLF if present
-            if content.endswith(b"\r\n"):
-                content = content[:-2]
-            dispo_line = next((h for h in headers_blob.split("\r\n") if h.lower().startswith("content-disposition:")), "")
-            if "name=\"file\"" in dispo_line:
-                file_bytes = content
-                break
-        if file_bytes is None:
-            return respond("400 Bad Request", render_bulk_form(message="No file part named 'file'."))
+        if size > BULK_UPLOAD_MAX_BYTES:
+            return respond_page(
+                start_response,
+                "413 Payload Too Large",
+                render_bulk_form(message=f"Upload exceeds {BULK_UPLOAD_MAX_BYTES // (1024 * 1024)} MB."),
+            )
+        fd, csv_path = tempfile.mkstemp(prefix="bulk-", suffix=".csv")
+        os.close(fd)
         try:
-            text = file_bytes.decode("utf-8-sig", errors="replace")
-        except Exception as exc:
-            return respond("400 Bad Request", render_bulk_form(message=f"Failed to decode file: {exc}"))
+            if StreamingFormDataParser is not None:
+                has_file, detect = _spool_upload_streaming(environ, content_type, size, csv_path)
+            else:
+                has_file, detect = _spool_upload_buffered(environ, boundary, size, csv_path)
+        except ValueError as exc:
+            os.unlink(csv_path)
+            return respond_page(start_response, "400 Bad Request", render_bulk_form(message=str(exc)))
+        if not has_file:
+            os.unlink(csv_path)
+            return respond_page(
+                start_response, "400 Bad Request", render_bulk_form(message="No file part named 'file'.")
+            )
 
         # Count rows quickly for user feedback
         try:
-            total_rows = sum(1 for _ in csv.reader(io.StringIO(text)))
+            with open(csv_path, encoding="utf-8-sig", errors="replace", newline="") as fp:
+                total_rows = sum(1 for _ in csv.reader(fp))
         except Exception:
             total_rows = 0
 
-        def _background_process(csv_text: str, delay_seconds: float) -> None:
-            reader_local = csv.reader(io.StringIO(csv_text))
-            rows_local = list(reader_local)
-            if not rows_local:
-                return
-            header_local = [h.strip().lower() for h in rows_local[0]]
-            has_header_local = (
-                "url" in header_local or "name" in header_local or "firm" in header_local
-            )
-            start_idx_local = 1 if has_header_local else 0
-
-            def get_cols_local(row):
-                if has_header_local:
-                    mapping = {
-                        header_local[i]: (row[i].strip() if i < len(row) else "")
-                        for i in range(len(header_local))
-                    }
-                    return mapping.get("url", ""), mapping.get("name", ""), mapping.get("firm", "")
-                url = row[0].strip() if len(row) > 0 else ""
-                name = row[1].strip() if len(row) > 1 else ""
-                firm = row[2].strip() if len(row) > 2 else ""
-                return url, name, firm
-
-            added_urls: set[str] = set()
-            for row in rows_local[start_idx_local:]:
-                if not row or all((cell or "").strip() == "" for cell in row):
-                    continue
-                url, name, firm = get_cols_local(row)
-                if not url.lower().startswith("http"):
-                    continue
-                # Avoid long request time: do not auto-detect here; rely on tracker run
-                # If name missing, try a lightweight detect but without sleep
-                if not name:
-                    try:
-                        res = fetch_public_headline(url)
-                        if not res.get("error"):
-                            name = (res.get("name_from_page") or "").strip() or name
-                            if not firm:
-                                firm = (res.get("company") or "").strip() or firm
-                    except Exception:
-                        pass
-                if not name:
-                    name = url  # fallback so record is created; user can edit later
-                try:
-                    add_person(name=name, firm=(firm or None), profile_url=url)
-                    added_urls.add(url)
-                except Exception:
-                    continue
-
-            # Auto-run tracker for newly added profiles
-            if added_urls:
-                people_all = list_people()
-                for idx, person in enumerate(people_all):
-                    if person["profile_url"] not in added_urls:
-                        continue
-                    try:
-                        result = fetch_public_headline(person["profile_url"])
-                    except Exception:
-                        continue
-                    error = result.get("error")
-                    observed_title = result.get("title")
-                    observed_company = result.get("company")
-                    if error or (observed_title is None and observed_company is None):
-                        continue
-                    try:
-                        detect_and_record_change(person, observed_title, observed_company)
-                    except Exception:
-                        continue
-                    if idx < len(people_all) - 1 and delay_seconds:
-                        time.sleep(delay_seconds)
-
-        threading.Thread(target=_background_process, args=(text, state.delay_seconds), daemon=True).start()
+        _bulk_executor.submit(
+            _ingest_bulk_upload, csv_path, self.state.delay_seconds, detect
+        ).add_done_callback(_report_bulk_failure)
         queued_msg = (
             f"Upload received. Queued processing for approximately {max(0, total_rows - 1)} rows. "
             "You can navigate away; entries will appear on the People page as they are added."
         )
-        return respond("200 OK", render_bulk_form(message=queued_msg))
-
-    if method == "GET" and path == "/history.csv":
-        # Stream CSV in-memory for simplicity
-        # Build CSV using existing query logic
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow([
-            "timestamp",
-            "name",
-            "firm",
-            "old_title",
-            "new_title",
-            "old_company",
-            "new_company",
-            "change_type",
-        ])
-        # replicate export query
-        from db import get_conn
+        return respond_page(start_response, "200 OK", render_bulk_form(message=queued_msg))
 
-        conn = get_conn()
-        try:
-            cur = conn.execute(
-                """
-                SELECT
-                    h.timestamp,
-                    p.name,
-                    p.firm,
-                    h.old_title,
-                    h.new_title,
-                    h.old_company,
-                    h.new_company,
-                    h.change_type
-                FROM history h
-                JOIN people p ON p.id = h.person_id
-                ORDER BY h.timestamp ASC
-                """
-            )
-            for row in cur.fetchall():
-                writer.writerow(row)
-        finally:
-            conn.close()
-
-        data = output.getvalue().encode("utf-8")
+    def history_csv(self, environ: dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        # Stream the CSV as the cursor produces rows; no Content-Length, so the
+        # response is close-delimited and memory stays flat.
         start_response(
             "200 OK",
             [
                 ("Content-Type", "text/csv; charset=utf-8"),
-                ("Content-Length", str(len(data))),
                 ("Content-Disposition", "attachment; filename=history.csv"),
             ],
         )
-        return [data]
+        return _stream_history()
+
+    def not_found(self, environ: dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        return respond_page(start_response, "404 Not Found", "<p>Not Found</p>")
+
+
+def _gzip_chunks(body: Iterable[bytes]) -> Iterator[bytes]:
+    """Compress a streamed body, flushing after every chunk so it stays streamed."""
 
-    # Fallback 404
-    return respond("404 Not Found", HTML_HEADER + "<p>Not Found</p>" + HTML_FOOTER)
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+    try:
+        for chunk in body:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        close = getattr(body, "close", None)
+        if close is not None:
+            close()
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Return whether an Accept-Encoding header allows a gzip response.
+
+    An explicit `gzip` (or `x-gzip`) entry decides; otherwise `*` does. Either
+    is refused with `q=0`, and a malformed q-value counts as a refusal.
+    """
+
+    wildcard: Optional[bool] = None
+    for entry in accept_encoding.split(","):
+        coding, _, params = entry.partition(";")
+        coding = coding.strip().lower()
+        if coding not in ("gzip", "x-gzip", "*"):
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding == "*":
+            wildcard = quality > 0
+        else:
+            return quality > 0
+    return bool(wildcard)
+
+
+def gzip_middleware(wsgi_app: Callable) -> Callable:
+    """Wrap a WSGI app to gzip HTML, CSV and text responses for clients that accept it.
+
+    Buffered (list) bodies are compressed in one go with a fresh Content-Length;
+    streamed bodies are compressed chunk by chunk. Every response of those types
+    carries `Vary: Accept-Encoding`, compressed or not, so shared caches keep the
+    variants apart. The wrapped app must call `start_response` before returning,
+    and not use the legacy `write` callable.
+    """
+
+    def wrapped(environ: dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        captured: list = []
+
+        def capture(status: str, headers: list[tuple[str, str]], exc_info: Any = None) -> None:
+            captured[:] = [status, headers, exc_info]
+            return None
+
+        body = wsgi_app(environ, capture)
+        status, headers, exc_info = captured
+        header_names = {name.lower(): value for name, value in headers}
+        if (
+            not header_names.get("content-type", "").startswith(_GZIP_TYPES)
+            or "content-encoding" in header_names
+        ):
+            start_response(status, headers, exc_info)
+            return body
+
+        headers = [*headers, ("Vary", "Accept-Encoding")]
+        buffered = isinstance(body, list)
+        if not _accepts_gzip(environ.get("HTTP_ACCEPT_ENCODING", "")) or (
+            buffered and sum(map(len, body)) < GZIP_MIN_BYTES
+        ):
+            start_response(status, headers, exc_info)
+            return body
+
+        headers = [(name, value) for name, value in headers if name.lower() != "content-length"]
+        headers.append(("Content-Encoding", "gzip"))
+        if buffered:
+            data = zlib.compress(b"".join(body), GZIP_LEVEL, wbits=31)
+            headers.append(("Content-Length", str(len(data))))
+            start_response(status, headers, exc_info)
+            return [data]
+        start_response(status, headers, exc_info)
+        return _gzip_chunks(body)
+
+    return wrapped
 
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
@@ -590,14 +1077,27 @@ def main(argv: list[str] | None = None) -> int:
         print("Delay must be non-negative", file=sys.stderr)
         return 1
     init_db()
+    # Warm the LinkedIn connection in the background so startup is not delayed
+    threading.Thread(target=prewarm_session, daemon=True).start()
     state = AppState(delay_seconds=args.delay_seconds)
 
-    with make_server(args.host, args.port, lambda env, sr: app({**env, "app.state": state}, sr)) as httpd:
-        print(f"Serving on http://{args.host}:{args.port}")
-        try:
-            httpd.serve_forever()
-        except KeyboardInterrupt:
-            print("\nShutting down...")
+    wsgi_app = gzip_middleware(WSGIApp(state))
+
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        from waitress import serve
+    except ImportError:
+        # Single-threaded fallback: requests are handled one at a time
+        from wsgiref.simple_server import make_server
+
+        with make_server(args.host, args.port, wsgi_app) as httpd:
+            try:
+                httpd.serve_forever()
+            except KeyboardInterrupt:
+                print("\nShutting down...")
+        return 0
+
+    serve(wsgi_app, host=args.host, port=args.port, threads=SERVER_THREADS, asyncore_use_poll=True)
     return 0
 
 